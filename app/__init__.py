@@ -5,6 +5,10 @@ from flask import Flask, request
 from celery import Celery
 from flask_cors import CORS
 from config import config
+from .cache import TTLCache
+from .compression import compress_response
+from .schemas import SUGGEST_FIELDS
+from .stats import Counters
 
 els_client = None
 
@@ -33,6 +37,37 @@ def create_celery_app(app=None, config_name='development'):
     return celery
 
 
+def create_els_client(app_config):
+    """
+    Create Elasticsearch client from configuration
+
+    :param app_config: Flask app configuration
+    :type app_config: dict
+
+    :return: Elasticsearch client
+    :rtype: Elasticsearch
+    """
+    hosts = app_config['ELS_HOSTS']
+    if hosts is None:
+        hosts = [{'host': app_config['ELS_HOST'], 'port': app_config['ELS_PORT']}]
+
+    headers = None
+    if not app_config['ELS_KEEP_ALIVE']:
+        headers = {'connection': 'close'}
+
+    return Elasticsearch(
+        hosts,
+        maxsize=app_config['ELS_MAXSIZE'],
+        headers=headers,
+        timeout=app_config['ELS_TIMEOUT'],
+        max_retries=app_config['ELS_MAX_RETRIES'],
+        retry_on_timeout=app_config['ELS_RETRY_ON_TIMEOUT'],
+        sniff_on_start=app_config['ELS_SNIFF_ON_START'],
+        sniff_on_connection_fail=app_config['ELS_SNIFF_ON_CONNECTION_FAIL'],
+        sniffer_timeout=app_config['ELS_SNIFFER_TIMEOUT']
+    )
+
+
 def create_app(config_name='default'):
     """
     Create Flask app
@@ -41,18 +76,36 @@ def create_app(config_name='default'):
     :return: Flask
     """
     from .api import blueprint as api_blueprint
+    from .api.autocomplete import create_prefix_indices, start_prefix_index_poller
 
     app = Flask(__name__)
     CORS(app, resources={r"/api/*": {"origins": "*"}})
 
     app.config.from_object(config[config_name])
     config[config_name].init_app(app)
-    app.els_client = Elasticsearch([{'host': config[config_name].ELS_HOST, 'port': config[config_name].ELS_PORT}])
+    app.els_client = create_els_client(app.config)
+    app.principal_cache = TTLCache(
+        app.config['PRINCIPAL_CACHE_SIZE'],
+        min(app.config['PRINCIPAL_CACHE_TTL'], app.config['TOKEN_EXPIRATION_TIME'])
+    )
+    app.rejected_tokens = TTLCache(app.config['REJECTED_TOKEN_CACHE_SIZE'], app.config['REJECTED_TOKEN_CACHE_TTL'])
+    app.token_rejections = Counters()
+    app.autocomplete_caches = dict(
+        (name, TTLCache(app.config['AUTOCOMPLETE_CACHE_SIZE'], app.config['AUTOCOMPLETE_CACHE_TTL']))
+        for name in ('customers', 'contacts', 'consultants')
+    )
+    app.suggest_mappings = TTLCache(len(SUGGEST_FIELDS), app.config['AUTOCOMPLETE_SUGGEST_CHECK_TTL'])
+    app.prefix_indices = create_prefix_indices(app.config) if app.config['PREFIX_INDEX_ENABLED'] else None
+    app.compressed_cache = TTLCache(app.config['COMPRESS_CACHE_SIZE'], app.config['COMPRESS_CACHE_TTL'])
+    app.compression_savings = Counters()
 
     app.register_blueprint(api_blueprint)
 
     extensions(app)
 
+    if app.prefix_indices is not None:
+        start_prefix_index_poller(app)
+
     @app.after_request
     def after_request(response):
         response.headers.add('Access-Control-Allow-Origin', '*')
@@ -61,7 +114,7 @@ def create_app(config_name='default'):
             headers = request.headers.get('Access-Control-Request-Headers')
             if headers:
                 response.headers['Access-Control-Allow-Headers'] = headers
-        return response
+        return compress_response(response)
 
     return app
 
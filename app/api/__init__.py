@@ -30,10 +30,12 @@ from .endpoints.needs import ns as needs_namespace
 from .endpoints.customers import ns as customers_namespace
 from .endpoints.contacts import ns as contacts_namespace
 from .endpoints.consultants import ns as consultants_namespace
+from .endpoints.stats import ns as stats_namespace
 
 api.add_namespace(postman_namespace)
 api.add_namespace(token_namespace)
 api.add_namespace(needs_namespace)
 api.add_namespace(customers_namespace)
 api.add_namespace(contacts_namespace)
-api.add_namespace(consultants_namespace)
\ No newline at end of file
+api.add_namespace(consultants_namespace)
+api.add_namespace(stats_namespace)
\ No newline at end of file
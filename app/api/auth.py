@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+from flask import g, current_app
+from flask_httpauth import HTTPTokenAuth
+from app.elastic import get_user_from_id
+from app.models import User, Principal
+
+# ================================================================================================
+# AUTH
+# ================================================================================================
+#
+#   Auth verification shared by token protected namespaces
+#
+# ================================================================================================
+
+auth = HTTPTokenAuth(scheme='Token')
+
+
+def get_principal_from_id(user_id):
+    """
+    Return principal from user unique ID,
+    read from process cache before Elasticsearch.
+    Users are only written by scripts outside the app, so nothing invalidates
+    cached principals: PRINCIPAL_CACHE_TTL bounds how long a changed user is stale.
+
+    :param user_id: User unique ID
+    :type user_id: str
+
+    :return: Principal if user exist
+    :rtype: Principal|None
+    """
+    principal = current_app.principal_cache.get(user_id)
+
+    if principal is None:
+        user = get_user_from_id(user_id, ['Name', 'Role'])
+
+        if not user:
+            return None
+
+        principal = Principal.from_user(user)
+        current_app.principal_cache.set(user_id, principal)
+
+    return principal
+
+
+@auth.verify_token
+def verify_token(token):
+    """
+    Verify auth token
+
+    :param token: User token
+    :type token: str
+
+    :return: True if valid token, else False
+    :rtype: bool
+    """
+    claims = User.verify_auth_token(token)
+
+    if claims is None:
+        return False
+
+    principal = Principal.from_claims(claims) or get_principal_from_id(claims['id'])
+
+    if not principal:
+        return False
+
+    g.user = principal
+    return True
@@ -0,0 +1,391 @@
+# -*- coding: utf-8 -*-
+
+import re
+import time
+from threading import Thread
+from elasticsearch import ElasticsearchException, RequestError
+from flask import current_app
+from app.elastic import get_possible_customers, get_possible_contacts, get_possible_consultants, \
+    scan_customer_versions, scan_consultant_versions, get_customers_from_ids, get_consultants_from_ids, \
+    get_index_write_marker, suggest_customers, suggest_contacts, suggest_consultants, has_suggest_field
+from app.prefix_index import PollingPrefixIndex, fold
+
+# Source fields rendered by autocomplete serializers
+NAME_FIELDS = ['Name']
+
+
+def create_prefix_indices(app_config):
+    """
+    Create in process prefix indices of customers and consultants
+
+    :param app_config: Flask app configuration
+    :type app_config: dict
+
+    :return: Prefix indices by name
+    :rtype: dict
+    """
+    return {
+        'customers': PollingPrefixIndex(
+            scan_customer_versions,
+            lambda customer_ids: get_customers_from_ids(customer_ids, NAME_FIELDS).values(),
+            lambda: get_index_write_marker('rastarockets_customers'),
+            app_config['PREFIX_INDEX_MAX_AGE']
+        ),
+        'consultants': PollingPrefixIndex(
+            scan_consultant_versions,
+            lambda consultant_ids: get_consultants_from_ids(consultant_ids, NAME_FIELDS).values(),
+            lambda: get_index_write_marker('rastarockets_users'),
+            app_config['PREFIX_INDEX_MAX_AGE']
+        )
+    }
+
+
+def start_prefix_index_poller(app):
+    """
+    Start thread refreshing app prefix indices, requests never wait for a refresh
+
+    :param app: Flask app
+    :type app: Flask
+
+    :return: Poller thread
+    :rtype: Thread
+    """
+
+    def poll():
+        with app.app_context():
+            while True:
+                for name, prefix_index in app.prefix_indices.items():
+                    # Any error, from Elasticsearch or a malformed document, must not stop the poller
+                    try:
+                        prefix_index.refresh()
+                    except Exception:
+                        app.logger.exception('Unable to refresh %s prefix index, autocomplete falls back to '
+                                             'Elasticsearch until it succeeds', name)
+
+                time.sleep(app.config['PREFIX_INDEX_POLL_INTERVAL'])
+
+    thread = Thread(target=poll, name='prefix-index-poller', daemon=True)
+    thread.start()
+
+    return thread
+
+
+def search_prefix_index(index_name, prefix, size):
+    """
+    Return result from in process prefix index
+
+    :param index_name: Prefix index name
+    :type index_name: str
+
+    :param prefix: Name prefix
+    :type prefix: str
+
+    :param size: Maximum number of results
+    :type size: int
+
+    :return: Matching entries, None if index is disabled or stale
+    :rtype: list|None
+    """
+    prefix_indices = current_app.prefix_indices
+
+    if prefix_indices is None:
+        return None
+
+    return prefix_indices[index_name].search(prefix, size)
+
+
+def normalize_prefix(prefix):
+    """
+    Return prefix used as cache key
+
+    :param prefix: Name prefix
+    :type prefix: str
+
+    :return: Lowercase prefix with collapsed spaces
+    :rtype: str
+    """
+    return ' '.join(prefix.lower().split())
+
+
+def get_cached(cache_name, key, fetch):
+    """
+    Return cached autocomplete result, fetch and store it on miss
+
+    :param cache_name: Autocomplete cache name
+    :type cache_name: str
+
+    :param key: Cache key
+    :type key: tuple
+
+    :param fetch: Function returning result on miss
+    :type fetch: callable
+
+    :return: Autocomplete result
+    :rtype: list
+    """
+    cache = current_app.autocomplete_caches[cache_name]
+    result = cache.get(key)
+
+    if result is None:
+        result = fetch()
+        cache.set(key, result)
+
+    return result
+
+
+def use_suggester(index, doc_type):
+    """
+    Return True if completion suggester is enabled and mapped for document type,
+    mapping state is checked once per AUTOCOMPLETE_SUGGEST_CHECK_TTL
+
+    :param index: Index name
+    :type index: str
+
+    :param doc_type: Document type
+    :type doc_type: str
+
+    :return: Suggester state
+    :rtype: bool
+    """
+    if not current_app.config['AUTOCOMPLETE_SUGGEST']:
+        return False
+
+    key = (index, doc_type)
+    mapped = current_app.suggest_mappings.get(key)
+
+    if mapped is None:
+        try:
+            mapped = has_suggest_field(index, doc_type)
+        except ElasticsearchException:
+            return False
+
+        current_app.suggest_mappings.set(key, mapped)
+
+        if not mapped:
+            current_app.logger.warning('No completion field for %s in %s, autocomplete uses match query '
+                                       'until reindex with manage_indices.py', doc_type, index)
+
+    return mapped
+
+
+def suggest_or_match(index, doc_type, suggest, match):
+    """
+    Return completion suggester result if usable, match query result otherwise
+
+    :param index: Index name
+    :type index: str
+
+    :param doc_type: Document type
+    :type doc_type: str
+
+    :param suggest: Function returning suggester result
+    :type suggest: callable
+
+    :param match: Function returning match query result
+    :type match: callable
+
+    :return: Autocomplete result
+    :rtype: list
+    """
+    if use_suggester(index, doc_type):
+        try:
+            return suggest()
+        except RequestError:
+            # Mapping changed since last check, match query until next one
+            current_app.suggest_mappings.set((index, doc_type), False)
+            current_app.logger.warning('Completion suggester failed for %s in %s', doc_type, index, exc_info=True)
+
+    return match()
+
+
+def name_matches(name, prefix, suggest):
+    """
+    Return True if name would be returned by Elasticsearch for prefix,
+    used to narrow a cached result locally
+
+    :param name: Document name
+    :type name: str
+
+    :param prefix: Normalized prefix
+    :type prefix: str
+
+    :param suggest: Completion suggester semantics, match query (operator and) otherwise
+    :type suggest: bool
+
+    :return: Match state
+    :rtype: bool
+    """
+    if suggest:
+        # Completion inputs are the whole name and each word suffix (see get_name_suggest)
+        words = fold(name).split(' ')
+        prefix = fold(prefix)
+
+        return any(' '.join(words[i:]).startswith(prefix) for i in range(len(words)))
+
+    # Each query token must start a name word, edge n-grams stop at 20 characters
+    words = re.findall(r'\w+', name.lower())
+
+    return all(
+        len(token) <= 20 and any(word.startswith(token) for word in words)
+        for token in re.findall(r'\w+', prefix)
+    )
+
+
+def get_from_shorter_prefix(cache_name, prefix, key_suffix, size, matches):
+    """
+    Return result narrowed locally from cached result of a shorter prefix.
+    A result holding size entries may be truncated, it cannot be narrowed.
+
+    :param cache_name: Autocomplete cache name
+    :type cache_name: str
+
+    :param prefix: Normalized prefix
+    :type prefix: str
+
+    :param key_suffix: Cache key items following prefix
+    :type key_suffix: tuple
+
+    :param size: Number of results
+    :type size: int
+
+    :param matches: Function returning True if entry name matches prefix
+    :type matches: callable
+
+    :return: Expiry time of shorter prefix result and narrowed result, None if no usable shorter prefix result
+    :rtype: tuple|None
+    """
+    cache = current_app.autocomplete_caches[cache_name]
+
+    for end in range(len(prefix) - 1, 0, -1):
+        entry = cache.get_entry((prefix[:end],) + key_suffix)
+
+        if entry is not None:
+            expires, result = entry
+
+            if len(result) >= size:
+                return None
+
+            return expires, [item for item in result if matches(item.name)]
+
+    return None
+
+
+def get_size(size):
+    """
+    Return number of results, bounded by configuration
+
+    :param size: Requested number of results
+    :type size: int|None
+
+    :return: Number of results
+    :rtype: int
+    """
+    if size is None or size <= 0:
+        return current_app.config['AUTOCOMPLETE_SIZE']
+
+    return min(size, current_app.config['AUTOCOMPLETE_MAX_SIZE'])
+
+
+def complete_customers(prefix, size=None):
+    """
+    Return possible customers from prefix
+
+    :param prefix: Prefix of customer name
+    :type prefix: str
+
+    :param size: Maximum number of results (optional)
+    :type size: int
+
+    :return: List of possible customers
+    :rtype: list
+    """
+    size = get_size(size)
+
+    customers = search_prefix_index('customers', prefix, size)
+    if customers is not None:
+        return customers
+
+    key = (normalize_prefix(prefix), size)
+
+    return get_cached('customers', key, lambda: suggest_or_match(
+        'rastarockets_customers',
+        'customer',
+        lambda: suggest_customers(prefix, size, NAME_FIELDS),
+        lambda: get_possible_customers(prefix, size, NAME_FIELDS)
+    ))
+
+
+def complete_contacts(prefix, customer_id=None, size=None):
+    """
+    Return possible contacts from prefix
+
+    :param prefix: Prefix of contact name
+    :type prefix: str
+
+    :param customer_id: Customer ID (optional)
+    :type customer_id: str|None
+
+    :param size: Maximum number of results (optional)
+    :type size: int
+
+    :return: List of possible contacts
+    :rtype: list
+    """
+    size = get_size(size)
+    normalized = normalize_prefix(prefix)
+    suggest = use_suggester('rastarockets_customers', 'contact')
+    cache = current_app.autocomplete_caches['contacts']
+    key = (normalized, customer_id, size)
+
+    contacts = cache.get(key)
+    if contacts is not None:
+        return contacts
+
+    # Contacts have no prefix index, typing on after a complete result costs no query.
+    # Narrowed result expires with its source, chained narrowing never outlives the TTL.
+    narrowed = get_from_shorter_prefix('contacts', normalized, (customer_id, size), size,
+                                       lambda name: name_matches(name, normalized, suggest))
+    if narrowed is not None:
+        expires, contacts = narrowed
+        cache.set(key, contacts, expires)
+
+        return contacts
+
+    contacts = suggest_or_match(
+        'rastarockets_customers',
+        'contact',
+        lambda: suggest_contacts(prefix, customer_id, size, NAME_FIELDS),
+        lambda: get_possible_contacts(prefix, customer_id, size, NAME_FIELDS)
+    )
+    cache.set(key, contacts)
+
+    return contacts
+
+
+def complete_consultants(prefix, size=None):
+    """
+    Return possible consultants from prefix
+
+    :param prefix: Prefix of consultant name
+    :type prefix: str
+
+    :param size: Maximum number of results (optional)
+    :type size: int
+
+    :return: List of possible consultants
+    :rtype: list
+    """
+    size = get_size(size)
+
+    consultants = search_prefix_index('consultants', prefix, size)
+    if consultants is not None:
+        return consultants
+
+    key = (normalize_prefix(prefix), size)
+
+    return get_cached('consultants', key, lambda: suggest_or_match(
+        'rastarockets_users',
+        'user',
+        lambda: suggest_consultants(prefix, size, NAME_FIELDS),
+        lambda: get_possible_consultants(prefix, size, NAME_FIELDS)
+    ))
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+import json
+from functools import wraps
+from flask import g, request, Response
+from flask_restplus import abort
+from flask_restplus.utils import unpack
+from app.utils import hash_sha256
+
+
+class NotModified(Exception):
+    """
+    Raised by views when client representation is still current
+    """
+
+    def __init__(self, etag):
+        """
+        Constructor
+
+        :param etag: Current entity tag
+        :type etag: str
+        """
+        super(NotModified, self).__init__(etag)
+        self.etag = etag
+
+
+def get_version_etag(document):
+    """
+    Return entity tag of document, from its Elasticsearch version
+
+    :param document: Need or need content
+    :type document: Need|NeedContent
+
+    :return: Entity tag
+    :rtype: str
+    """
+    return str(document.version)
+
+
+def get_collection_etag(documents, *extra):
+    """
+    Return entity tag of documents list, hash of unique IDs and versions
+
+    :param documents: Needs or need contents
+    :type documents: list
+
+    :param extra: Other rendered values (cursor, total, facets)
+    :type extra: tuple
+
+    :return: Entity tag
+    :rtype: str
+    """
+    state = [[document.id, document.version] for document in documents]
+    state.append(list(extra))
+
+    return hash_sha256(json.dumps(state, sort_keys=True, default=str))[:32]
+
+
+def check_not_modified(etag):
+    """
+    Set entity tag of response, raise NotModified if client already has it.
+    Must be called before building response body.
+
+    :param etag: Current entity tag
+    :type etag: str
+    """
+    g.etag = etag
+
+    if request.if_none_match.contains_weak(etag):
+        raise NotModified(etag)
+
+
+def get_if_match_version():
+    """
+    Return version expected by If-Match header
+
+    :return: Expected version, None if header is missing or wildcard
+    :rtype: int|None
+    """
+    if_match = request.if_match
+
+    if not if_match or if_match.star_tag:
+        return None
+
+    # Compressed responses carry weak tags, they still name the version
+    etags = if_match.as_set(include_weak=True)
+
+    if len(etags) != 1 or not next(iter(etags)).isdigit():
+        abort(412, error='Invalid If-Match header')
+
+    return int(next(iter(etags)))
+
+
+def conditional(f):
+    """
+    Add ETag header to view response, answer 304 on NotModified.
+    Must decorate view above marshal_with.
+    """
+
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        try:
+            result = f(*args, **kwargs)
+
+        except NotModified as e:
+            response = Response(status=304)
+            response.set_etag(e.etag)
+
+            return response
+
+        etag = g.get('etag')
+
+        if etag is None or isinstance(result, Response):
+            return result
+
+        data, code, headers = unpack(result)
+        headers = dict(headers)
+        headers['ETag'] = '"{0}"'.format(etag)
+
+        return data, code, headers
+
+    return wrapper
@@ -1,53 +1,15 @@
 # -*- coding: utf-8 -*-
 
-from flask import request, g
+from flask import request
 from flask_restplus import Namespace, Resource, abort
-from flask_httpauth import HTTPTokenAuth
-from app.elastic import get_user_from_id, get_possible_contacts
-from app.models import User
 from ..serializers.customers import contact_data_container
+from ..auth import auth
+from ..autocomplete import complete_contacts
 from ..parsers import contact_autocomplete_parser
 
 
 ns = Namespace('contacts', description='Contacts related operations')
 
-# ================================================================================================
-# AUTH
-# ================================================================================================
-#
-#   Auth verification
-#
-# ================================================================================================
-
-auth = HTTPTokenAuth(scheme='Token')
-
-
-@auth.verify_token
-def verify_token(token):
-    """
-    Verify auth token
-
-    :param token: User token
-    :type token: str
-
-    :return: True if valid token, else False
-    :rtype: bool
-    """
-    user_id = User.verify_auth_token(token)
-
-    if user_id is None:
-        return False
-
-    else:
-        user = get_user_from_id(user_id)
-
-        if not user:
-            return False
-
-        g.user = user
-        return True
-
-
 # ================================================================================================
 # ENDPOINTS
 # ================================================================================================
@@ -73,7 +35,7 @@ class ContactsAutocomplete(Resource):
         customer_id = args.get('customer_id')
 
         if name_prefix is not None and name_prefix != '':
-            possible_contacts = get_possible_contacts(name_prefix, customer_id)
+            possible_contacts = complete_contacts(name_prefix, customer_id, args.get('size'))
 
             return {'contacts': possible_contacts}
 
@@ -1,53 +1,15 @@
 # -*- coding: utf-8 -*-
 
-from flask import request, g
+from flask import request
 from flask_restplus import Namespace, Resource, abort
-from flask_httpauth import HTTPTokenAuth
-from app.elastic import get_user_from_id, get_possible_customers
-from app.models import User
 from ..serializers.customers import customer_data_container
+from ..auth import auth
+from ..autocomplete import complete_customers
 from ..parsers import customer_autocomplete_parser
 
 
 ns = Namespace('customers', description='Customers related operations')
 
-# ================================================================================================
-# AUTH
-# ================================================================================================
-#
-#   Auth verification
-#
-# ================================================================================================
-
-auth = HTTPTokenAuth(scheme='Token')
-
-
-@auth.verify_token
-def verify_token(token):
-    """
-    Verify auth token
-
-    :param token: User token
-    :type token: str
-
-    :return: True if valid token, else False
-    :rtype: bool
-    """
-    user_id = User.verify_auth_token(token)
-
-    if user_id is None:
-        return False
-
-    else:
-        user = get_user_from_id(user_id)
-
-        if not user:
-            return False
-
-        g.user = user
-        return True
-
-
 # ================================================================================================
 # ENDPOINTS
 # ================================================================================================
@@ -72,7 +34,7 @@ class CustomerAutocomplete(Resource):
         name_prefix = args.get('name')
 
         if name_prefix is not None and name_prefix != '':
-            possible_customers = get_possible_customers(name_prefix)
+            possible_customers = complete_customers(name_prefix, args.get('size'))
 
             return {'customers': possible_customers}
 
@@ -3,58 +3,32 @@
 import os
 from datetime import datetime
 
-from flask import request, g, current_app, send_from_directory
-from flask_httpauth import HTTPTokenAuth
-from flask_restplus import Namespace, Resource, abort
+from flask import request, g, current_app, send_from_directory, json, Response, stream_with_context
+from flask_restplus import Namespace, Resource, abort, marshal
 from flask.ext.mail import Message
-
-from app.elastic import get_user_from_id, get_need_from_id, delete_need_from_id, get_needs, get_customer_from_id, \
-    get_contact_from_id, get_consultant_from_id, add_need_from_parameters, update_need, add_need_content, \
-    get_need_content_from_id, delete_need_content_from_id
-
-from app.models import User
-from app.utils import allowed_file
-from ..parsers import need_parser, upload_parser
-from ..serializers.needs import need_post, need_put, need_minimal, need_data_container, need_content, need_complete
+from elasticsearch.exceptions import ConflictError
+
+from app.elastic import get_need_from_id, delete_need_from_id, get_needs, get_needs_after, add_need_from_parameters, \
+    update_need, add_need_content, get_need_content_from_id, delete_need_content_from_id, delete_need_contents, \
+    delete_needs_from_ids, scan_needs, add_needs_from_parameters, update_needs_from_ids
+
+from app.utils import allowed_file, remove_files_in_background, encode_cursor, decode_cursor
+from ..auth import auth
+from ..conditional import conditional, check_not_modified, get_version_etag, get_collection_etag, \
+    get_if_match_version
+from ..references import hydrate_needs, hydrate_need, hydrate_facets, validate_need_references, \
+    resolve_need_references, get_missing_references
+from ..parsers import need_parser, need_export_parser, upload_parser
+from ..serializers.needs import need_post, need_put, need_minimal, need_data_container, need_content, need_complete, \
+    need_batch_delete, need_batch_update, need_batch_result, need_batch_create, need_batch_create_result
 
 ns = Namespace('needs', description='Needs related operations')
 
-# ================================================================================================
-# AUTH
-# ================================================================================================
-#
-#   Auth verification
-#
-# ================================================================================================
-
-auth = HTTPTokenAuth(scheme='Token')
-
-
-@auth.verify_token
-def verify_token(token):
-    """
-    Verify auth token
-
-    :param token: User token
-    :type token: str
-
-    :return: True if valid token, else False
-    :rtype: bool
-    """
-    user_id = User.verify_auth_token(token)
-
-    if user_id is None:
-        return False
-
-    else:
-        user = get_user_from_id(user_id)
-
-        if not user:
-            return False
-
-        g.user = user
-        return True
+# Source fields rendered by need minimal serializer
+NEED_MINIMAL_FIELDS = ['CreatedAt', 'Customer', 'Contact', 'Title', 'StartAtLatest', 'Status']
 
+# Source fields needed to check need ownership
+OWNER_FIELDS = ['Author']
 
 # ================================================================================================
 # ENDPOINTS
@@ -68,6 +42,8 @@ def verify_token(token):
 class NeedCollection(Resource):
     decorators = [auth.login_required]
 
+    @ns.response(304, 'Need collection not modified')
+    @conditional
     @ns.marshal_with(need_data_container)
     @ns.expect(need_parser)
     def get(self):
@@ -76,20 +52,51 @@ class NeedCollection(Resource):
         """
 
         args = need_parser.parse_args()
-        size = args.get('size') if args.get('size') else 20
-        start = args.get('page') * size if args.get('page') else 0
+        size = args.get('size') if args.get('size') is not None else 20
+
+        if size < 0:
+            abort(400, error='Invalid size')
 
         title = args.get('title')
         status = args.get('status')
         customer_id = args.get('customer')
 
-        needs = get_needs(start, size, g.user.id, title, status, customer_id)
+        page = args.get('page')
+
+        if page is not None and page < 0:
+            abort(400, error='Invalid page')
+
+        if page is not None:
+            needs = get_needs(page * size, size, g.user.id, title, status, customer_id,
+                              NEED_MINIMAL_FIELDS)
+            check_not_modified(get_collection_etag(needs))
+
+            return {'needs': hydrate_needs(needs)}
+
+        # Cursor only resumes the search it was returned for, sort values depend on query
+        query = [title, status, customer_id]
+
+        try:
+            search_after = decode_cursor(args.get('cursor'), query) if args.get('cursor') else None
+        except ValueError:
+            abort(400, error='Invalid cursor')
+
+        # size=0 with facets only runs aggregations, hits are not fetched
+        facets_size = current_app.config['NEED_FACETS_SIZE'] if args.get('facets') else None
+
+        needs, last_sort, total, facets = get_needs_after(size, search_after, g.user.id, title, status,
+                                                          customer_id, facets_size, NEED_MINIMAL_FIELDS)
 
-        for need in needs:
-            need.customer_obj = get_customer_from_id(need.customer)
-            need.contact_obj = get_contact_from_id(need.contact)
+        next_cursor = encode_cursor(last_sort, query) if last_sort else None
+        total = total if args.get('total') else None
+        check_not_modified(get_collection_etag(needs, next_cursor, total, facets))
 
-        return {'needs': needs}
+        return {
+            'needs': hydrate_needs(needs),
+            'next_cursor': next_cursor,
+            'total': total,
+            'facets': hydrate_facets(facets) if facets is not None else None
+        }
 
     @ns.marshal_with(need_minimal, code=201, description='Need successfully created.')
     @ns.doc(responses={
@@ -106,30 +113,25 @@ class NeedCollection(Resource):
         if not data.get('created_at'):
             data['created_at'] = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
 
-        if not get_customer_from_id(data.get('customer')):
-            abort(400, error='Customer not found')
-
-        if not get_contact_from_id(data.get('contact')):
-            abort(400, error='Contact not found')
-
-        if data.get('consultants'):
-            for consultant in data.get('consultants'):
-                if not get_consultant_from_id(consultant):
-                    abort(400, error='Consultant not found')
-
         if data.get('status') not in ['open', 'win', 'lost']:
             abort(400, error='Invalid status choice')
 
+        customers, contacts, _ = validate_need_references(
+            data.get('customer'),
+            data.get('contact'),
+            data.get('consultants')
+        )
+
         data['author'] = g.user.id
 
         need = add_need_from_parameters(data)
-        need.customer_obj = get_customer_from_id(need.customer)
-        need.contact_obj = get_contact_from_id(need.contact)
 
         if not need:
             abort(400, error='Error during save need')
 
         else:
+            need.customer_obj = customers.get(need.customer)
+            need.contact_obj = contacts.get(need.contact)
 
             msg = Message('Need need added',
                           recipients=["a.verdier@outlook.fr"])
@@ -139,11 +141,141 @@ class NeedCollection(Resource):
             return need, 201
 
 
+@ns.route('/export')
+class NeedExport(Resource):
+    decorators = [auth.login_required]
+
+    @ns.expect(need_export_parser)
+    @ns.produces(['application/x-ndjson'])
+    def get(self):
+        """
+        Export all needs as newline delimited JSON
+        """
+
+        args = need_export_parser.parse_args()
+        batches = scan_needs(
+            current_app.config['EXPORT_BATCH_SIZE'],
+            g.user.id,
+            args.get('title'),
+            args.get('status'),
+            args.get('customer'),
+            NEED_MINIMAL_FIELDS
+        )
+
+        def generate():
+            for batch in batches:
+                yield ''.join(json.dumps(marshal(need, need_minimal)) + '\n' for need in hydrate_needs(batch))
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+@ns.route('/batch')
+class NeedBatch(Resource):
+    decorators = [auth.login_required]
+
+    @ns.marshal_with(need_batch_create_result)
+    @ns.expect(need_batch_create)
+    def post(self):
+        """
+        Add needs
+        """
+
+        items = request.json.get('needs') or []
+        results = [None] * len(items)
+
+        for data in items:
+            if not data.get('created_at'):
+                data['created_at'] = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+
+            data['author'] = g.user.id
+
+        references = resolve_need_references(
+            [data.get('customer') for data in items],
+            [data.get('contact') for data in items],
+            [consultant for data in items for consultant in data.get('consultants') or []]
+        )
+
+        valid = []
+        for position, data in enumerate(items):
+            if data.get('status') not in ['open', 'win', 'lost']:
+                results[position] = {'status': 400, 'error': 'Invalid status choice'}
+                continue
+
+            missing = get_missing_references(references, data.get('customer'), data.get('contact'),
+                                             data.get('consultants'))
+            if len(missing) > 0:
+                results[position] = {'status': 400, 'error': 'References not found', 'missing': missing}
+                continue
+
+            valid.append(position)
+
+        needs = add_needs_from_parameters([items[position] for position in valid])
+
+        for position, need in zip(valid, needs):
+            if need:
+                results[position] = {'id': need.id, 'status': 201}
+            else:
+                results[position] = {'status': 400, 'error': 'Error during save need'}
+
+        return {'results': results}
+
+    @ns.marshal_with(need_batch_result)
+    @ns.doc(responses={
+        400: 'Validation error'
+    })
+    @ns.expect(need_batch_update)
+    def patch(self):
+        """
+        Update status or consultants of needs
+        """
+
+        data = request.json
+        parameters = {
+            'status': data.get('status'),
+            'consultants': data.get('consultants')
+        }
+
+        if not parameters['status'] and not parameters['consultants']:
+            abort(400, error='Nothing to update')
+
+        if parameters['status'] and parameters['status'] not in ['open', 'win', 'lost']:
+            abort(400, error='Invalid status choice')
+
+        if parameters['consultants']:
+            validate_need_references(consultant_ids=parameters['consultants'])
+
+        results = update_needs_from_ids(data.get('ids') or [], parameters, g.user.id)
+
+        return {'results': [
+            {'id': need_id, 'status': 204} if updated else {'id': need_id, 'status': 404, 'error': 'Need not found'}
+            for need_id, updated in results.items()
+        ]}
+
+    @ns.marshal_with(need_batch_result)
+    @ns.expect(need_batch_delete)
+    def delete(self):
+        """
+        Delete needs
+        """
+
+        results = delete_needs_from_ids(request.json.get('ids'), g.user.id)
+
+        deleted_ids = [need_id for need_id, deleted in results.items() if deleted]
+        remove_files_in_background(current_app.config['UPLOAD_FOLDER'], delete_need_contents(deleted_ids))
+
+        return {'results': [
+            {'id': need_id, 'status': 204} if deleted else {'id': need_id, 'status': 404, 'error': 'Need not found'}
+            for need_id, deleted in results.items()
+        ]}
+
+
 @ns.route('/<need_id>')
 @ns.response(404, 'Need not found')
 class NeedItem(Resource):
     decorators = [auth.login_required]
 
+    @ns.response(304, 'Need not modified')
+    @conditional
     @ns.marshal_with(need_complete)
     def get(self, need_id):
         """
@@ -154,19 +286,15 @@ class NeedItem(Resource):
         if not need or need.author != g.user.id:
             abort(404)
 
-        need.customer_obj = get_customer_from_id(need.customer)
-        need.contact_obj = get_contact_from_id(need.contact)
+        check_not_modified(get_version_etag(need))
 
-        need.consultants_obj = []
-        for consultant in need.consultants:
-            need.consultants_obj.append(get_consultant_from_id(consultant))
-
-        return need
+        return hydrate_need(need)
 
     @ns.response(204, 'Need successfully updated.')
     @ns.doc(responses={
         409: 'Value exist',
-        400: 'Validation error'
+        400: 'Validation error',
+        412: 'Need modified since If-Match version'
     })
     @ns.expect(need_put)
     def put(self, need_id):
@@ -174,25 +302,30 @@ class NeedItem(Resource):
         Update need
         """
 
-        need = get_need_from_id(need_id)
-        if not need or need.author != g.user.id:
-            abort(404)
-
         data = request.json
+        version = get_if_match_version()
+
+        if data.get('status') and data.get('status') not in ['open', 'win', 'lost']:
+            abort(400, error='Invalid status choice')
 
         consultants = data.get('consultants')
         if consultants and len(consultants) > 0:
-            for consultant in consultants:
-                if not get_consultant_from_id(consultant):
-                    abort(400, error='Consultant not found')
+            validate_need_references(consultant_ids=consultants)
 
-        if data.get('status') and data.get('status') not in ['open', 'win', 'lost']:
-            abort(400, error='Invalid status choice')
+        try:
+            updated = update_need(need_id, data, g.user.id, version)
+        except ConflictError:
+            # Version is compared before ownership script runs, only its author may learn need exists
+            need = get_need_from_id(need_id, OWNER_FIELDS)
+            if not need or need.author != g.user.id:
+                abort(404)
 
-        if update_need(need_id, data):
-            return 'Need successfully updated.', 204
-        else:
-            abort(400, error='Unable to update need.')
+            abort(412, error='Need has been modified')
+
+        if not updated:
+            abort(404)
+
+        return 'Need successfully updated.', 204
 
     @ns.response(204, 'Need successfully deleted.')
     def delete(self, need_id):
@@ -200,15 +333,12 @@ class NeedItem(Resource):
         Delete need
         """
 
-        need = get_need_from_id(need_id)
-        if not need or need.author != g.user.id:
+        if not delete_need_from_id(need_id, g.user.id):
             abort(404)
 
-        if delete_need_from_id(need_id):
-            return 'Need successfully deleted.', 204
+        remove_files_in_background(current_app.config['UPLOAD_FOLDER'], delete_need_contents([need_id]))
 
-        else:
-            abort(400, error='Unable to deleted need #{0}'.format(need_id))
+        return 'Need successfully deleted.', 204
 
 
 @ns.route('/<need_id>/contents')
@@ -226,7 +356,7 @@ class NeedContentCollection(Resource):
         Upload need content
         """
 
-        need = get_need_from_id(need_id)
+        need = get_need_from_id(need_id, OWNER_FIELDS)
         if not need or need.author != g.user.id:
             abort(404)
 
@@ -267,7 +397,7 @@ class NeedContentItem(Resource):
         Return need content
         """
 
-        need = get_need_from_id(need_id)
+        need = get_need_from_id(need_id, OWNER_FIELDS)
         if not need or need.author != g.user.id:
             abort(404)
 
@@ -281,7 +411,7 @@ class NeedContentItem(Resource):
             delete_need_content_from_id(content.id)
             abort(400, error='Need have no content')
 
-        return send_from_directory(current_app.config['UPLOAD_FOLDER'], content.filename)
+        return send_from_directory(current_app.config['UPLOAD_FOLDER'], content.filename, conditional=True)
 
     @ns.response(204, 'Need content successfully deleted')
     def delete(self, need_id, content_id):
@@ -289,7 +419,7 @@ class NeedContentItem(Resource):
         Delete need content
         """
 
-        need = get_need_from_id(need_id)
+        need = get_need_from_id(need_id, OWNER_FIELDS)
         if not need or need.author != g.user.id:
             abort(404)
 
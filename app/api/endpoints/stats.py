@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+from flask import current_app
+from flask_restplus import Namespace, Resource
+from app.stats import get_connection_pool_stats
+from ..auth import auth
+
+ns = Namespace('stats', description='Process statistics')
+
+
+# ================================================================================================
+# ENDPOINTS
+# ================================================================================================
+#
+#   API stats endpoint
+#
+# ================================================================================================
+
+@ns.route('/')
+class StatsResource(Resource):
+    decorators = [auth.login_required]
+
+    def get(self):
+        """
+        Return counters of current process
+        """
+
+        return {
+            'auth': {
+                'principal_cache': current_app.principal_cache.stats(),
+                'rejected_tokens': current_app.rejected_tokens.stats(),
+                'rejections': current_app.token_rejections.as_dict()
+            },
+            'autocomplete': dict(
+                (name, cache.stats()) for name, cache in current_app.autocomplete_caches.items()
+            ),
+            'prefix_indices': dict(
+                (name, prefix_index.stats()) for name, prefix_index in (current_app.prefix_indices or {}).items()
+            ),
+            'elasticsearch': {
+                'pools': get_connection_pool_stats(current_app.els_client)
+            },
+            'compression': {
+                'cache': current_app.compressed_cache.stats(),
+                'bytes_saved': current_app.compression_savings.as_dict()
+            }
+        }
@@ -8,6 +8,9 @@ from ..serializers import auth_token
 
 ns = Namespace('token', description='Token related operations')
 
+# Source fields needed to check password and sign token claims
+CREDENTIAL_FIELDS = ['PasswordHash', 'Name', 'Role']
+
 # ================================================================================================
 # AUTH
 # ================================================================================================
@@ -34,7 +37,7 @@ def verify_password(email, password):
     :rtype: bool
     """
 
-    user = get_user_from_email(email)
+    user = get_user_from_email(email, CREDENTIAL_FIELDS)
 
     if not user:
         return False
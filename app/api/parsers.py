@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from werkzeug.datastructures import FileStorage
+from flask_restplus import inputs
 from ..api import api
 
 
@@ -13,13 +14,25 @@ need_parser.add_argument('customer', required=False, type=str, help='Customer na
 need_parser.add_argument('title', required=False, type=str, help='Need title')
 need_parser.add_argument('status', required=False, choices=('open','win', 'lost'), help='Bad choice: {error_msg}')
 need_parser.add_argument('size', required=False, type=int, help='Number of needs')
+need_parser.add_argument('cursor', required=False, type=str, help='Cursor of next page (ignored with page)')
+need_parser.add_argument('total', required=False, type=inputs.boolean, default=False, help='Return total count')
+need_parser.add_argument('facets', required=False, type=inputs.boolean, default=False,
+                         help='Return status and customer counts (ignored with page)')
+
+need_export_parser = api.parser()
+need_export_parser.add_argument('customer', required=False, type=str, help='Customer name')
+need_export_parser.add_argument('title', required=False, type=str, help='Need title')
+need_export_parser.add_argument('status', required=False, choices=('open','win', 'lost'), help='Bad choice: {error_msg}')
 
 customer_autocomplete_parser = api.parser()
 customer_autocomplete_parser.add_argument('name', required=True, help='Customer name')
+customer_autocomplete_parser.add_argument('size', required=False, type=int, help='Maximum number of results')
 
 contact_autocomplete_parser = api.parser()
 contact_autocomplete_parser.add_argument('name', required=True, help='Contact name')
 contact_autocomplete_parser.add_argument('customer_id', required=False, help='Customer unique ID')
+contact_autocomplete_parser.add_argument('size', required=False, type=int, help='Maximum number of results')
 
 name_autocomplete_parser = api.parser()
-name_autocomplete_parser.add_argument('name', required=True, help='Customer name')
\ No newline at end of file
+name_autocomplete_parser.add_argument('name', required=True, help='Customer name')
+name_autocomplete_parser.add_argument('size', required=False, type=int, help='Maximum number of results')
\ No newline at end of file
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+from flask_restplus import abort
+from app.elastic import get_need_references
+
+
+# Source fields rendered by customer, contact and consultant minimal serializers
+REFERENCE_FIELDS = {
+    'customer': ['Name'],
+    'contact': ['Name'],
+    'user': ['Name']
+}
+
+
+def resolve_need_references(customer_ids=(), contact_ids=(), consultant_ids=()):
+    """
+    Return customers, contacts and consultants referenced by needs,
+    with the fields rendered by their serializers
+
+    :param customer_ids: Customers unique IDs (optional)
+    :type customer_ids: list
+
+    :param contact_ids: Contacts unique IDs (optional)
+    :type contact_ids: list
+
+    :param consultant_ids: Consultants unique IDs (optional)
+    :type consultant_ids: list
+
+    :return: Found customers, contacts and consultants by unique ID
+    :rtype: tuple
+    """
+
+    return get_need_references(customer_ids, contact_ids, consultant_ids, REFERENCE_FIELDS)
+
+
+def hydrate_needs(needs, with_consultants=False):
+    """
+    Attach customer, contact and optionally consultant objects to needs,
+    all distinct references are fetched in one round trip
+
+    :param needs: Needs to hydrate
+    :type needs: list
+
+    :param with_consultants: Attach consultants objects (optional)
+    :type with_consultants: bool
+
+    :return: Hydrated needs
+    :rtype: list
+    """
+
+    consultant_ids = []
+    if with_consultants:
+        for need in needs:
+            consultant_ids.extend(need.consultants)
+
+    customers, contacts, consultants = resolve_need_references(
+        [need.customer for need in needs],
+        [need.contact for need in needs],
+        consultant_ids
+    )
+
+    for need in needs:
+        need.customer_obj = customers.get(need.customer)
+        need.contact_obj = contacts.get(need.contact)
+
+        if with_consultants:
+            need.consultants_obj = [consultants[consultant] for consultant in need.consultants
+                                    if consultant in consultants]
+
+    return needs
+
+
+def hydrate_facets(facets):
+    """
+    Attach customer objects to customer facet buckets
+
+    :param facets: Buckets by facet name
+    :type facets: dict
+
+    :return: Hydrated facets
+    :rtype: dict
+    """
+
+    customers, _, _ = resolve_need_references([bucket['key'] for bucket in facets['customer']])
+
+    for bucket in facets['customer']:
+        bucket['customer_obj'] = customers.get(bucket['key'])
+
+    return facets
+
+
+def hydrate_need(need):
+    """
+    Attach customer, contact and consultant objects to need
+
+    :param need: Need to hydrate
+    :type need: Need
+
+    :return: Hydrated need
+    :rtype: Need
+    """
+
+    return hydrate_needs([need], with_consultants=True)[0]
+
+
+def get_missing_references(references, customer_id=None, contact_id=None, consultant_ids=None):
+    """
+    Return need references absent from resolved references
+
+    :param references: Found customers, contacts and consultants by unique ID
+    :type references: tuple
+
+    :param customer_id: Customer unique ID (optional)
+    :type customer_id: str
+
+    :param contact_id: Contact unique ID (optional)
+    :type contact_id: str
+
+    :param consultant_ids: Consultants unique IDs (optional)
+    :type consultant_ids: list
+
+    :return: Missing references (type, id)
+    :rtype: list
+    """
+
+    customers, contacts, consultants = references
+
+    missing = []
+    for kind, ids, found in (('customer', [customer_id] if customer_id is not None else [], customers),
+                             ('contact', [contact_id] if contact_id is not None else [], contacts),
+                             ('consultant', consultant_ids or [], consultants)):
+        for ref_id in ids:
+            if ref_id not in found and {'type': kind, 'id': ref_id} not in missing:
+                missing.append({'type': kind, 'id': ref_id})
+
+    return missing
+
+
+def validate_need_references(customer_id=None, contact_id=None, consultant_ids=None):
+    """
+    Check existence of need references in one round trip,
+    abort with every missing reference if any
+
+    :param customer_id: Customer unique ID (optional)
+    :type customer_id: str
+
+    :param contact_id: Contact unique ID (optional)
+    :type contact_id: str
+
+    :param consultant_ids: Consultants unique IDs (optional)
+    :type consultant_ids: list
+
+    :return: Found customers, contacts and consultants by unique ID
+    :rtype: tuple
+    """
+
+    customer_ids = [customer_id] if customer_id is not None else []
+    contact_ids = [contact_id] if contact_id is not None else []
+    consultant_ids = consultant_ids or []
+
+    customers, contacts, consultants = resolve_need_references(customer_ids, contact_ids, consultant_ids)
+    missing = get_missing_references((customers, contacts, consultants), customer_id, contact_id, consultant_ids)
+
+    if len(missing) > 0:
+        abort(400, error='References not found', missing=missing)
+
+    return customers, contacts, consultants
@@ -66,6 +66,64 @@ need_content = api.model('Need Content', {
     'filename': fields.String(required=True, description='Content filename')
 })
 
+need_facet = api.model('Need facet', {
+    'key': fields.String(required=True, description='Facet value'),
+    'count': fields.Integer(required=True, description='Number of needs with value')
+})
+
+need_customer_facet = api.inherit('Need customer facet', need_facet, {
+    'customer_obj': fields.Nested(customer_minimal, allow_null=True, description='Customer Object')
+})
+
+need_facets = api.model('Need facets', {
+    'status': fields.List(fields.Nested(need_facet), description='Needs count by status'),
+    'customer': fields.List(fields.Nested(need_customer_facet), description='Needs count by customer')
+})
+
 need_data_container = api.model('Need DataContainer', {
-    'needs': fields.List(fields.Nested(need_minimal))
+    'needs': fields.List(fields.Nested(need_minimal)),
+    'next_cursor': fields.String(required=False, description='Cursor of next page, null on last page'),
+    'total': fields.Integer(required=False, description='Total number of needs, if requested'),
+    'facets': fields.Nested(need_facets, required=False, allow_null=True, description='Facet counts, if requested')
+})
+
+need_batch_delete = api.model('Need batch DELETE', {
+    'ids': fields.List(fields.String(description='Need unique ID'), required=True,
+                       description='Needs unique ID', min_items=1, max_items=100)
+})
+
+need_batch_item_result = api.model('Need batch item result', {
+    'id': fields.String(required=False, description='Need unique ID'),
+    'status': fields.Integer(required=True, description='HTTP status of item'),
+    'error': fields.String(required=False, description='Error message')
+})
+
+need_batch_result = api.model('Need batch result', {
+    'results': fields.List(fields.Nested(need_batch_item_result))
+})
+
+need_batch_update = api.model('Need batch PATCH', {
+    'ids': fields.List(fields.String(description='Need unique ID'), required=True,
+                       description='Needs unique ID', min_items=1, max_items=100),
+    'status': fields.String(required=False, description='Need status (Open, Win, Lost)', min_length=3, max_length=64),
+    'consultants': fields.List(fields.String(description='Consultant ids', min_length=3, max_length=64),
+                               description='Consultants unique ID', max_items=5)
+})
+
+need_batch_create = api.model('Need batch POST', {
+    'needs': fields.List(fields.Nested(need_post), required=True, description='Needs to add',
+                         min_items=1, max_items=100)
+})
+
+need_reference = api.model('Need reference', {
+    'type': fields.String(required=True, description='Reference type (customer, contact, consultant)'),
+    'id': fields.String(required=True, description='Reference unique ID')
+})
+
+need_batch_create_item_result = api.inherit('Need batch create item result', need_batch_item_result, {
+    'missing': fields.List(fields.Nested(need_reference), required=False, description='References not found')
+})
+
+need_batch_create_result = api.model('Need batch create result', {
+    'results': fields.List(fields.Nested(need_batch_create_item_result))
 })
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+import time
+from collections import OrderedDict
+from threading import Lock
+
+
+class TTLCache:
+    """
+    Bounded LRU cache with time to live,
+    shared by all threads of a process
+    """
+
+    def __init__(self, maxsize, ttl, timer=time.monotonic):
+        """
+        Constructor
+
+        :param maxsize: Maximum number of entries
+        :type maxsize: int
+
+        :param ttl: Entry time to live (seconds)
+        :type ttl: float
+
+        :param timer: Clock function (optional)
+        :type timer: callable
+        """
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._timer = timer
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key, default=None):
+        """
+        Return cached value
+
+        :param key: Entry key
+        :type key: object
+
+        :param default: Value returned on miss (optional)
+        :type default: object
+
+        :return: Cached value if fresh, else default
+        :rtype: object
+        """
+        entry = self.get_entry(key)
+
+        return entry[1] if entry is not None else default
+
+    def get_entry(self, key):
+        """
+        Return cached value with its expiry time
+
+        :param key: Entry key
+        :type key: object
+
+        :return: Expiry time and value if fresh, else None
+        :rtype: tuple|None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry[0] <= self._timer():
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry
+
+    def set(self, key, value, expires=None):
+        """
+        Store value, evict least recently used entry if full
+
+        :param key: Entry key
+        :type key: object
+
+        :param value: Value to cache
+        :type value: object
+
+        :param expires: Expiry time, from a value derived of another entry (optional, time to live if None)
+        :type expires: float
+        """
+        with self._lock:
+            self._entries[key] = (expires if expires is not None else self._timer() + self._ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        """
+        Remove entry
+
+        :param key: Entry key
+        :type key: object
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Remove all entries
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Return cache statistics
+
+        :return: Size, hits and misses
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxsize': self._maxsize,
+                'hits': self._hits,
+                'misses': self._misses
+            }
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+import gzip
+import zlib
+from flask import current_app, request
+
+ENCODINGS = ('gzip', 'deflate')
+
+
+def compress(data, encoding, level):
+    """
+    Compress response body
+
+    :param data: Response body
+    :type data: bytes
+
+    :param encoding: Content encoding (gzip or deflate)
+    :type encoding: str
+
+    :param level: Compression level (1 to 9)
+    :type level: int
+
+    :return: Compressed body
+    :rtype: bytes
+    """
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=level)
+
+    return zlib.compress(data, level)
+
+
+def get_compressed(data, encoding, cacheable):
+    """
+    Return compressed body, from pre-compressed cache for static payloads
+
+    :param data: Response body
+    :type data: bytes
+
+    :param encoding: Content encoding (gzip or deflate)
+    :type encoding: str
+
+    :param cacheable: Keep compressed body of this endpoint
+    :type cacheable: bool
+
+    :return: Compressed body
+    :rtype: bytes
+    """
+    level = current_app.config['COMPRESS_LEVEL']
+
+    if not cacheable:
+        return compress(data, encoding, level)
+
+    cache = current_app.compressed_cache
+    key = (request.endpoint, encoding)
+    cached = cache.get(key)
+
+    # Keep uncompressed body with result, a changed payload is compressed again
+    if cached is not None and cached[0] == data:
+        return cached[1]
+
+    compressed = compress(data, encoding, level)
+    cache.set(key, (data, compressed))
+
+    return compressed
+
+
+def compress_response(response):
+    """
+    Compress response with encoding accepted by client,
+    streamed and file responses are sent as is
+
+    :param response: Flask response
+    :type response: Response
+
+    :return: Response
+    :rtype: Response
+    """
+    app_config = current_app.config
+
+    if response.mimetype not in app_config['COMPRESS_MIMETYPES']:
+        return response
+
+    response.vary.add('Accept-Encoding')
+
+    if response.direct_passthrough or response.is_streamed or 'Content-Encoding' in response.headers \
+            or not 200 <= response.status_code < 300 or response.status_code == 204:
+        return response
+
+    encoding = request.accept_encodings.best_match(ENCODINGS)
+    if encoding is None or not request.accept_encodings[encoding]:
+        return response
+
+    data = response.get_data()
+    if len(data) < app_config['COMPRESS_MIN_SIZE']:
+        return response
+
+    compressed = get_compressed(data, encoding, request.endpoint in app_config['COMPRESS_CACHE_ENDPOINTS'])
+
+    if len(compressed) >= len(data):
+        return response
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+
+    # Same tag for every encoding, only weak validators may be shared between representations
+    etag, weak = response.get_etag()
+    if etag is not None and not weak:
+        response.set_etag(etag, weak=True)
+
+    current_app.compression_savings.increment(request.endpoint, len(data) - len(compressed))
+
+    return response
@@ -1,17 +1,137 @@
 # -*- coding: utf-8 -*-
 
+from collections import OrderedDict
 from flask import current_app
 from .models import User, Need, Customer, CustomerContact, NeedContent
+from .schemas import SUGGEST_FIELDS
 from elasticsearch_dsl import Search
+from elasticsearch_dsl.result import Result
 
 
-def get_user_from_email(email, index='rastarockets_users'):
+def get_document(doc_id, index, doc_type, fields=None):
     """
-    Return user from unique email address
+    Return document from unique ID with realtime GET
+
+    :param doc_id: Document unique ID
+    :type doc_id: str
+
+    :param index: Index name
+    :type index: str
+
+    :param doc_type: Document type
+    :type doc_type: str
+
+    :param fields: Source fields to return (optional, all if None)
+    :type fields: list
+
+    :return: Document if exist
+    :rtype: Result|None
+    """
+
+    if not doc_id:
+        return None
+
+    response = current_app.els_client.get(
+        index=index,
+        doc_type=doc_type,
+        id=doc_id,
+        _source_include=fields,
+        ignore=404
+    )
+
+    if response.get('found'):
+        return Result(response)
+
+    else:
+        return None
+
+
+def get_documents(doc_ids, index, doc_type, fields=None):
+    """
+    Return documents from unique IDs with one multi GET
+
+    :param doc_ids: Documents unique IDs, duplicates are fetched once
+    :type doc_ids: list
+
+    :param index: Index name
+    :type index: str
+
+    :param doc_type: Document type
+    :type doc_type: str
+
+    :param fields: Source fields to return (optional, all if None)
+    :type fields: list
+
+    :return: Found documents
+    :rtype: list
+    """
+
+    ids = list(OrderedDict.fromkeys(doc_id for doc_id in doc_ids if doc_id))
+
+    if len(ids) == 0:
+        return []
+
+    response = current_app.els_client.mget(
+        index=index,
+        doc_type=doc_type,
+        body={'ids': ids},
+        _source_include=fields
+    )
+
+    return [Result(doc) for doc in response['docs'] if doc.get('found')]
+
+
+def with_role(fields):
+    """
+    Return source fields with Role, needed to check consultants
+
+    :param fields: Source fields (optional, all if None)
+    :type fields: list
+
+    :return: Source fields
+    :rtype: list|None
+    """
+
+    if fields is None or 'Role' in fields:
+        return fields
+
+    return list(fields) + ['Role']
+
+
+def get_indexed_document(response, body):
+    """
+    Return document from index response and indexed body,
+    without reading it back
+
+    :param response: Index API response
+    :type response: dict
+
+    :param body: Indexed body
+    :type body: dict
+
+    :return: Document
+    :rtype: Result
+    """
+
+    return Result({
+        '_index': response['_index'],
+        '_type': response['_type'],
+        '_id': response['_id'],
+        '_version': response['_version'],
+        '_source': body
+    })
+
+
+def get_user_from_email(email, fields=None, index='rastarockets_users'):
+    """
+    Return user from unique email address, compared case insensitively
 
     :param email: User email address
     :type email: str
 
+    :param fields: Source fields to return (optional, all if None)
+    :type fields: list
+
     :param index: Index name (optional)
     :type index: str
 
@@ -22,7 +142,10 @@ def get_user_from_email(email, index='rastarockets_users'):
     search = Search(
         using=current_app.els_client,
         index=index
-    ).query('match_phrase', Email=email)
+    ).filter('term', Email=email.lower())
+
+    if fields is not None:
+        search = search.source(fields)
 
     response = search.execute()
 
@@ -33,13 +156,16 @@ def get_user_from_email(email, index='rastarockets_users'):
         return None
 
 
-def get_user_from_id(user_id, index='rastarockets_users'):
+def get_user_from_id(user_id, fields=None, index='rastarockets_users'):
     """
     Return user from unique ID
 
     :param user_id: User unique ID
     :type user_id: str
 
+    :param fields: Source fields to return (optional, all if None)
+    :type fields: list
+
     :param index: Index name (optional)
     :type index: str
 
@@ -47,58 +173,92 @@ def get_user_from_id(user_id, index='rastarockets_users'):
     :rtype: User|None
     """
 
-    search = Search(
-        using=current_app.els_client,
-        index=index
-    ).query('term', _id=user_id)
-
-    response = search.execute()
+    document = get_document(user_id, index, 'user', fields)
 
-    if response.hits.total > 0:
-        return User(response.hits[0])
+    if document is not None:
+        return User(document)
 
     else:
         return None
 
 
-def get_need_from_id(need_id, index='rastarockets_needs'):
+def get_users_from_ids(user_ids, fields=None, index='rastarockets_users'):
+    """
+    Return users from unique IDs with one multi GET
+
+    :param user_ids: Users unique IDs
+    :type user_ids: list
+
+    :param fields: Source fields to return (optional, all if None)
+    :type fields: list
+
+    :param index: Index name (optional)
+    :type index: str
+
+    :return: Found users by unique ID
+    :rtype: dict
+    """
+
+    return dict(
+        (document.meta.id, User(document))
+        for document in get_documents(user_ids, index, 'user', fields)
+    )
+
+
+def get_need_from_id(need_id, fields=None, index='rastarockets_needs'):
     """
     Return need from unique ID
     
     :param need_id: Need unique ID
     :type need_id: str
     
+    :param fields: Source fields to return (optional, all if None)
+    :type fields: list
+
     :param index: Index name (optional)
     :type index: str
     
     :return: Need if exist
     :rtype: Need|None
     """
-    search = Search(
-        using=current_app.els_client,
-        index=index,
-        doc_type='need'
-    ).query('term', _id=need_id)
+    document = get_document(need_id, index, 'need', fields)
 
-    response = search.execute()
-    if response.hits.total > 0:
-        return Need(response.hits[0])
+    if document is not None:
+        return Need(document)
 
     else:
         return None
 
 
-def get_needs(start, size, author_id=None, title=None, status=None, customer_id=None, index='rastarockets_needs'):
+def get_needs_from_ids(need_ids, fields=None, index='rastarockets_needs'):
     """
-    Return list of needs from parameters
+    Return needs from unique IDs with one multi GET
 
-    :param start: Start index (pagination)
-    :type start: int
+    :param need_ids: Needs unique IDs
+    :type need_ids: list
 
-    :param size: Number of needs (pagination)
-    :type size: int
+    :param fields: Source fields to return (optional, all if None)
+    :type fields: list
 
-    :param author_id: Author ID of needs
+    :param index: Index name (optional)
+    :type index: str
+
+    :return: Found needs by unique ID
+    :rtype: dict
+    """
+
+    return dict(
+        (document.meta.id, Need(document))
+        for document in get_documents(need_ids, index, 'need', fields)
+    )
+
+
+def build_needs_search(author_id=None, title=None, status=None, customer_id=None, index='rastarockets_needs',
+                       sort=False):
+    """
+    Return needs search from parameters, hits carry their version
+
+    :param author_id: Author ID of needs (optional)
     :type author_id: str
 
     :param title: Title of need (optional)
@@ -110,14 +270,15 @@ def get_needs(start, size, author_id=None, title=None, status=None, customer_id=
     :param customer_id: Customer unique ID (optional)
     :type customer_id: str
 
-    :param index: Index name
+    :param index: Index name (optional)
     :type index: str
 
-    :return: List of needs
-    :rtype: list
-    """
+    :param sort: Sort by creation date then unique ID, by relevance first with title (optional)
+    :type sort: bool
 
-    needs = []
+    :return: Needs search
+    :rtype: Search
+    """
 
     search = Search(
         using=current_app.els_client,
@@ -126,18 +287,70 @@ def get_needs(start, size, author_id=None, title=None, status=None, customer_id=
     )
 
     if author_id is not None:
-        search = search.query('match_phrase', Author=author_id)
+        search = search.filter('term', Author=author_id)
 
     if title is not None:
         search = search.query('match', Title=title)
 
     if status is not None:
-        search = search.query('match_phrase', Status=status)
+        search = search.filter('term', Status=status)
 
     if customer_id is not None:
-        search = search.query('match_phrase', Customer=customer_id)
+        search = search.filter('term', Customer=customer_id)
+
+    search = search.extra(version=True)
+
+    if not sort:
+        return search
+
+    # Unique ID last keeps order total, as search_after requires
+    if title is not None:
+        return search.sort('_score', '-CreatedAt', '_uid')
+
+    return search.sort('-CreatedAt', '_uid')
+
+
+def get_needs(start, size, author_id=None, title=None, status=None, customer_id=None, fields=None,
+              index='rastarockets_needs'):
+    """
+    Return list of needs from parameters, in the order of cursor pages
+
+    :param start: Start index (pagination)
+    :type start: int
+
+    :param size: Number of needs (pagination)
+    :type size: int
+
+    :param author_id: Author ID of needs
+    :type author_id: str
+
+    :param title: Title of need (optional)
+    :type title: str
+
+    :param status: Status of need (optional)
+    :type status: str
 
-    search = search[start:size]
+    :param customer_id: Customer unique ID (optional)
+    :type customer_id: str
+
+    :param fields: Source fields to return (optional, all if None)
+    :type fields: list
+
+    :param index: Index name
+    :type index: str
+
+    :return: List of needs
+    :rtype: list
+    """
+
+    needs = []
+
+    # Same order as cursor pages, so offset pages never overlap them
+    search = build_needs_search(author_id, title, status, customer_id, index, sort=True)
+    search = search[start:start + size]
+
+    if fields is not None:
+        search = search.source(fields)
 
     response = search.execute()
 
@@ -147,18 +360,161 @@ def get_needs(start, size, author_id=None, title=None, status=None, customer_id=
     return needs
 
 
-def add_need_from_parameters(parameters, index='rastarockets_needs'):
+def add_need_facets(search, size):
     """
-    Add need from parameters
+    Add Status and Customer terms aggregations to needs search
 
-    :param parameters: Form parameters
-    :type parameters: dict
+    :param search: Needs search
+    :type search: Search
+
+    :param size: Number of buckets by facet
+    :type size: int
+
+    :return: Needs search with aggregations
+    :rtype: Search
+    """
+
+    search.aggs.bucket('status', 'terms', field='Status', size=size)
+    search.aggs.bucket('customer', 'terms', field='Customer', size=size)
+
+    return search
+
+
+def get_need_facets(response):
+    """
+    Return facet counts from needs search response
+
+    :param response: Needs search response, with aggregations added by add_need_facets
+    :type response: Response
+
+    :return: Buckets (key, count) by facet name
+    :rtype: dict
+    """
+
+    return dict(
+        (name, [{'key': bucket.key, 'count': bucket.doc_count} for bucket in response.aggregations[name].buckets])
+        for name in ('status', 'customer')
+    )
+
+
+def get_needs_after(size, search_after=None, author_id=None, title=None, status=None, customer_id=None,
+                    facets_size=None, fields=None, index='rastarockets_needs'):
+    """
+    Return page of needs following sort values of previous page (search_after),
+    with facet counts of all matching needs computed by the same request
+
+    :param size: Number of needs
+    :type size: int
+
+    :param search_after: Sort values of last need of previous page (optional)
+    :type search_after: list
+
+    :param author_id: Author ID of needs (optional)
+    :type author_id: str
+
+    :param title: Title of need (optional)
+    :type title: str
+
+    :param status: Status of need (optional)
+    :type status: str
+
+    :param customer_id: Customer unique ID (optional)
+    :type customer_id: str
+
+    :param facets_size: Number of buckets by facet (optional, no facets if None)
+    :type facets_size: int
+
+    :param fields: Source fields to return (optional, all if None)
+    :type fields: list
 
     :param index: Index name (optional)
     :type index: str
 
-    :return: Need created
-    :rtype: Need|None
+    :return: Needs, sort values of last need if page is full, total number of matching needs, facets if requested
+    :rtype: tuple
+    """
+
+    search = build_needs_search(author_id, title, status, customer_id, index, sort=True)
+    search = search[0:size]
+
+    if search_after:
+        search = search.extra(search_after=search_after)
+
+    if fields is not None:
+        search = search.source(fields)
+
+    if facets_size is not None:
+        search = add_need_facets(search, facets_size)
+
+    response = search.execute()
+    needs = [Need(need) for need in response]
+
+    last_sort = None
+    if size > 0 and len(needs) == size:
+        last_sort = list(response.hits[-1].meta.sort)
+
+    facets = get_need_facets(response) if facets_size is not None else None
+
+    return needs, last_sort, response.hits.total, facets
+
+
+def scan_needs(batch_size=500, author_id=None, title=None, status=None, customer_id=None,
+               fields=None, index='rastarockets_needs'):
+    """
+    Yield all needs from parameters by batches, with scroll API
+
+    :param batch_size: Number of needs per batch (optional)
+    :type batch_size: int
+
+    :param author_id: Author ID of needs (optional)
+    :type author_id: str
+
+    :param title: Title of need (optional)
+    :type title: str
+
+    :param status: Status of need (optional)
+    :type status: str
+
+    :param customer_id: Customer unique ID (optional)
+    :type customer_id: str
+
+    :param fields: Source fields to return (optional, all if None)
+    :type fields: list
+
+    :param index: Index name (optional)
+    :type index: str
+
+    :return: Generator of needs lists
+    :rtype: generator
+    """
+
+    search = build_needs_search(author_id, title, status, customer_id, index)
+    search = search.params(size=batch_size, scroll='1m')
+
+    if fields is not None:
+        search = search.source(fields)
+
+    batch = []
+    for need in search.scan():
+        batch.append(Need(need))
+
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+
+    if len(batch) > 0:
+        yield batch
+
+
+def get_need_body(parameters):
+    """
+    Return need document from parameters
+
+    :param parameters: Form parameters
+    :type parameters: dict
+
+    :return: Need document
+    :rtype: dict
     """
 
     body = {
@@ -199,59 +555,153 @@ def add_need_from_parameters(parameters, index='rastarockets_needs'):
                 'Id': consultant
             })
 
+    return body
+
+
+def add_need_from_parameters(parameters, index='rastarockets_needs'):
+    """
+    Add need from parameters
+
+    :param parameters: Form parameters
+    :type parameters: dict
+
+    :param index: Index name (optional)
+    :type index: str
+
+    :return: Need created
+    :rtype: Need|None
+    """
+
+    body = get_need_body(parameters)
+
     response = current_app.els_client.index(
         index=index,
         doc_type='need',
-        body=body
+        body=body,
+        refresh=current_app.config['ELS_REFRESH']
     )
 
     if response['result'] == 'created':
-        current_app.els_client.indices.refresh(index=index)
-        return get_need_from_id(response['_id'])
+        return Need(get_indexed_document(response, body))
 
     return None
 
 
-def get_need_content_from_id(content_id, index='rastarockets_needs'):
+def add_needs_from_parameters(parameters_list, index='rastarockets_needs'):
     """
-    Return need content from unique ID
+    Add needs from parameters with one bulk request, refreshed once
 
-    :param content_id: Need content unique ID
-    :type content_id: str
+    :param parameters_list: Form parameters of each need
+    :type parameters_list: list
 
     :param index: Index name (optional)
     :type index: str
 
-    :return: NeedContent if exist
-    :rtype: NeedContent|None
+    :return: Need created or None, in parameters order
+    :rtype: list
     """
-    search = Search(
-        using=current_app.els_client,
-        index=index,
-        doc_type='content'
-    ).query('term', _id=content_id)
 
-    response = search.execute()
-    if response.hits.total > 0:
-        return NeedContent(response.hits[0])
+    if len(parameters_list) == 0:
+        return []
 
-    else:
-        return None
+    bodies = [get_need_body(parameters) for parameters in parameters_list]
+
+    actions = []
+    for body in bodies:
+        actions.append({'index': {'_index': index, '_type': 'need'}})
+        actions.append(body)
+
+    response = current_app.els_client.bulk(body=actions, refresh=current_app.config['ELS_REFRESH'])
+
+    needs = []
+    for item, body in zip(response['items'], bodies):
+        if item['index'].get('result') == 'created':
+            needs.append(Need(get_indexed_document(item['index'], body)))
+        else:
+            needs.append(None)
+
+    return needs
+
+
+def get_need_content_from_id(content_id, fields=None, index='rastarockets_needs'):
+    """
+    Return need content from unique ID
+
+    :param content_id: Need content unique ID
+    :type content_id: str
+
+    :param fields: Source fields to return (optional, all if None)
+    :type fields: list
+
+    :param index: Index name (optional)
+    :type index: str
+
+    :return: NeedContent if exist
+    :rtype: NeedContent|None
+    """
+    document = get_document(content_id, index, 'content', fields)
+
+    if document is not None:
+        return NeedContent(document)
+
+    else:
+        return None
+
+
+def get_need_contents_from_ids(content_ids, fields=None, index='rastarockets_needs'):
+    """
+    Return need contents from unique IDs with one multi GET
+
+    :param content_ids: Need contents unique IDs
+    :type content_ids: list
+
+    :param fields: Source fields to return (optional, all if None)
+    :type fields: list
+
+    :param index: Index name (optional)
+    :type index: str
+
+    :return: Found need contents by unique ID
+    :rtype: dict
+    """
+
+    return dict(
+        (document.meta.id, NeedContent(document))
+        for document in get_documents(content_ids, index, 'content', fields)
+    )
 
 
 def add_need_content(need_id, filename, index='rastarockets_needs'):
+    """
+    Add need content
+
+    :param need_id: Need unique ID
+    :type need_id: str
+
+    :param filename: Content filename
+    :type filename: str
+
+    :param index: Index name (optional)
+    :type index: str
+
+    :return: NeedContent created
+    :rtype: NeedContent|None
+    """
+
+    body = {
+        'Need': need_id,
+        'Filename': filename
+    }
+
     response = current_app.els_client.index(
         index=index,
         doc_type='content',
-        body={
-            'Need': need_id,
-            'Filename': filename
-        }
+        body=body,
+        refresh=current_app.config['ELS_REFRESH']
     )
 
     if response['result'] == 'created':
-        current_app.els_client.indices.refresh(index=index)
-        return get_need_content_from_id(response['_id'])
+        return NeedContent(get_indexed_document(response, body))
 
     return None
 
@@ -270,30 +720,69 @@ def delete_need_content_from_id(content_id, index='rastarockets_needs'):
     :rtype: bool
     """
 
-    response = current_app.els_client.delete_by_query(
+    response = current_app.els_client.delete(
         index=index,
         doc_type='content',
-        body={
-            'query': {
-                'term': {'_id': content_id}
-            }
-        }
+        id=content_id,
+        refresh=current_app.config['ELS_REFRESH'],
+        ignore=404
     )
-    return response['deleted'] > 0
+    return response.get('result') == 'deleted'
 
 
-def update_need(need_id, parameters, index='rastarockets_needs'):
+def delete_need_contents(need_ids, index='rastarockets_needs'):
     """
-    Update need
+    Delete contents of needs with one bulk request.
+    Without refresh on writes (ELS_REFRESH false), index is refreshed first,
+    search would miss contents added since last refresh.
 
-    :param need_id: Need unique ID
-    :type need_id: str
+    :param need_ids: Needs unique IDs
+    :type need_ids: list
+
+    :param index: Index name (optional)
+    :type index: str
+
+    :return: Filenames of deleted contents
+    :rtype: list
+    """
+
+    if len(need_ids) == 0:
+        return []
+
+    # Content inserts already wait for refresh otherwise
+    if current_app.config['ELS_REFRESH'] == 'false':
+        current_app.els_client.indices.refresh(index=index)
+
+    search = Search(
+        using=current_app.els_client,
+        index=index,
+        doc_type='content'
+    ).filter('terms', Need=need_ids)
+    search = search.source(['Filename'])
+
+    actions = []
+    filenames = []
+    for content in search.scan():
+        actions.append({'delete': {'_index': index, '_type': 'content', '_id': content.meta.id}})
+        filenames.append(content.Filename)
+
+    if len(actions) == 0:
+        return []
+
+    current_app.els_client.bulk(body=actions, refresh=current_app.config['ELS_REFRESH'])
+
+    return filenames
+
+
+def get_need_update_body(parameters):
+    """
+    Return partial need document from update parameters
 
     :param parameters: Need parameters
     :type parameters: dict
 
-    :param index: Index name (optional)
-    :type index: str
+    :return: Partial need document
+    :rtype: dict
     """
 
     body = {}
@@ -308,7 +797,7 @@ def update_need(need_id, parameters, index='rastarockets_needs'):
         body['SuccessKeys'] = []
         for key in parameters.get('success_keys'):
             body['SuccessKeys'].append({
-                'key': key
+                'Key': key
             })
 
     if parameters.get('start_at_latest'):
@@ -329,83 +818,258 @@ def update_need(need_id, parameters, index='rastarockets_needs'):
 
         for consultant in consultants:
             body['Consultants'].append({
-                'id': consultant
+                'Id': consultant
             })
 
     if parameters.get('status'):
         body['Status'] = parameters.get('status')
 
+    return body
+
+
+# Merge params.doc into need only if it belongs to params.author, else leave it untouched (noop)
+OWNED_UPDATE_SCRIPT = (
+    "if (ctx._source.Author == params.author) {"
+    " ctx._source.putAll(params.doc);"
+    "} else {"
+    " ctx.op = 'none';"
+    "}"
+)
+
+# Delete need only if it belongs to params.author, else leave it untouched (noop)
+OWNED_DELETE_SCRIPT = (
+    "if (ctx._source.Author == params.author) {"
+    " ctx.op = 'delete';"
+    "} else {"
+    " ctx.op = 'none';"
+    "}"
+)
+
+
+def update_need(need_id, parameters, author_id, version=None, index='rastarockets_needs'):
+    """
+    Update need of author in one scripted update,
+    ownership is checked by the script so need is not read first.
+    Raise ConflictError if need version is not the expected one.
+
+    :param need_id: Need unique ID
+    :type need_id: str
+
+    :param parameters: Need parameters
+    :type parameters: dict
+
+    :param author_id: Author unique ID, need of other author is kept
+    :type author_id: str
+
+    :param version: Expected need version (optional)
+    :type version: int
+
+    :param index: Index name (optional)
+    :type index: str
+
+    :return: True if updated, False if need does not exist or belongs to other author
+    :rtype: bool
+    """
+
     response = current_app.els_client.update(
         index=index,
         doc_type='need',
         id=need_id,
-        body={'doc': body}
+        body={'script': {
+            'inline': OWNED_UPDATE_SCRIPT,
+            'lang': 'painless',
+            'params': {'author': author_id, 'doc': get_need_update_body(parameters)}
+        }},
+        version=version,
+        refresh=current_app.config['ELS_REFRESH'],
+        ignore=404
     )
 
-    return response['result'] == 'updated'
+    return response.get('result') == 'updated'
+
+
+def update_needs_from_ids(need_ids, parameters, author_id, index='rastarockets_needs'):
+    """
+    Apply same partial update to needs of author with one bulk request,
+    ownership is checked by the update script so needs are not read first
+
+    :param need_ids: Needs unique IDs
+    :type need_ids: list
+
+    :param parameters: Need parameters
+    :type parameters: dict
+
+    :param author_id: Author unique ID, needs of other authors are kept
+    :type author_id: str
+
+    :param index: Index name (optional)
+    :type index: str
+
+    :return: Update success by need unique ID
+    :rtype: dict
+    """
+
+    results = OrderedDict((need_id, False) for need_id in need_ids)
+
+    if len(results) == 0:
+        return results
+
+    script = {
+        'inline': OWNED_UPDATE_SCRIPT,
+        'lang': 'painless',
+        'params': {'author': author_id, 'doc': get_need_update_body(parameters)}
+    }
+
+    actions = []
+    for need_id in results:
+        actions.append({'update': {'_index': index, '_type': 'need', '_id': need_id}})
+        actions.append({'script': script})
 
+    response = current_app.els_client.bulk(body=actions, refresh=current_app.config['ELS_REFRESH'])
 
-def delete_need_from_id(need_id, index='rastarockets_needs'):
+    for item in response['items']:
+        results[item['update']['_id']] = item['update'].get('result') == 'updated'
+
+    return results
+
+
+def delete_need_from_id(need_id, author_id, index='rastarockets_needs'):
     """
-    Delete need from unique ID
+    Delete need of author in one scripted update,
+    ownership is checked by the script so need is not read first
 
     :param need_id: Need unique ID
     :type need_id: str
 
+    :param author_id: Author unique ID, need of other author is kept
+    :type author_id: str
+
     :param index: Index name (optional)
     :type index: str
 
-    :return: True if success, else False
+    :return: True if deleted, False if need does not exist or belongs to other author
     :rtype: bool
     """
 
-    response = current_app.els_client.delete_by_query(
+    response = current_app.els_client.update(
         index=index,
         doc_type='need',
-        body={
-            'query': {
-                'term': {'_id': need_id}
-            }
-        }
+        id=need_id,
+        body={'script': {
+            'inline': OWNED_DELETE_SCRIPT,
+            'lang': 'painless',
+            'params': {'author': author_id}
+        }},
+        refresh=current_app.config['ELS_REFRESH'],
+        ignore=404
     )
-    return response['deleted'] > 0
 
+    return response.get('result') == 'deleted'
+
+
+def delete_needs_from_ids(need_ids, author_id, index='rastarockets_needs'):
+    """
+    Delete needs of author from unique IDs with one bulk request,
+    ownership is checked by the update script so needs are not read first
+
+    :param need_ids: Needs unique IDs
+    :type need_ids: list
+
+    :param author_id: Author unique ID, needs of other authors are kept
+    :type author_id: str
+
+    :param index: Index name (optional)
+    :type index: str
+
+    :return: Deletion success by need unique ID
+    :rtype: dict
+    """
+
+    results = OrderedDict((need_id, False) for need_id in need_ids)
+
+    if len(results) == 0:
+        return results
+
+    script = {
+        'inline': OWNED_DELETE_SCRIPT,
+        'lang': 'painless',
+        'params': {'author': author_id}
+    }
+
+    actions = []
+    for need_id in results:
+        actions.append({'update': {'_index': index, '_type': 'need', '_id': need_id}})
+        actions.append({'script': script})
+
+    response = current_app.els_client.bulk(body=actions, refresh=current_app.config['ELS_REFRESH'])
+
+    for item in response['items']:
+        results[item['update']['_id']] = item['update'].get('result') == 'deleted'
+
+    return results
 
-def get_customer_from_id(customer_id, index='rastarockets_customers'):
+
+def get_customer_from_id(customer_id, fields=None, index='rastarockets_customers'):
     """
     Return customer from unique ID
 
     :param customer_id: Customer unique ID
     :type customer_id: str
 
+    :param fields: Source fields to return (optional, all if None)
+    :type fields: list
+
     :param index: Index name (optional)
     :type index: str
 
     :return: Customer if exist
     :rtype: Customer|None
     """
-    search = Search(
-        using=current_app.els_client,
-        index=index,
-        doc_type='customer'
-    ).query('term', _id=customer_id)
+    document = get_document(customer_id, index, 'customer', fields)
 
-    response = search.execute()
-
-    if response.hits.total > 0:
-        return Customer(response.hits[0])
+    if document is not None:
+        return Customer(document)
 
     else:
         return None
 
 
-def get_possible_customers(prefix, index='rastarockets_customers'):
+def get_customers_from_ids(customer_ids, fields=None, index='rastarockets_customers'):
+    """
+    Return customers from unique IDs with one multi GET
+
+    :param customer_ids: Customers unique IDs
+    :type customer_ids: list
+
+    :param fields: Source fields to return (optional, all if None)
+    :type fields: list
+
+    :param index: Index name (optional)
+    :type index: str
+
+    :return: Found customers by unique ID
+    :rtype: dict
+    """
+
+    return dict(
+        (document.meta.id, Customer(document))
+        for document in get_documents(customer_ids, index, 'customer', fields)
+    )
+
+
+def get_possible_customers(prefix, size=10, fields=None, index='rastarockets_customers'):
     """
     Return possible customers from prefix
 
     :param prefix: Prefix of customer name
     :type prefix: str
 
+    :param size: Maximum number of results (optional)
+    :type size: int
+
+    :param fields: Source fields to return (optional, all if None)
+    :type fields: list
+
     :param index: Index name (optional)
     :type index: str
 
@@ -421,6 +1085,11 @@ def get_possible_customers(prefix, index='rastarockets_customers'):
         doc_type='customer'
     ).query('match', Name=prefix)
 
+    search = search[0:size]
+
+    if fields is not None:
+        search = search.source(fields)
+
     response = search.execute()
 
     for customer in response:
@@ -429,35 +1098,181 @@ def get_possible_customers(prefix, index='rastarockets_customers'):
     return customers
 
 
-def get_contact_from_id(contact_id, index='rastarockets_customers'):
+def scan_customer_versions(index='rastarockets_customers'):
+    """
+    Return version of all customers, with scroll API and without source
+
+    :param index: Index name (optional)
+    :type index: str
+
+    :return: Version by customer unique ID
+    :rtype: dict
+    """
+
+    search = Search(
+        using=current_app.els_client,
+        index=index,
+        doc_type='customer'
+    ).source(False).extra(version=True)
+
+    return dict((customer.meta.id, customer.meta.version) for customer in search.scan())
+
+
+def suggest_documents(prefix, size, index, doc_type, contexts=None, fields=None):
+    """
+    Return documents from completion suggester on completion field of document type
+
+    :param prefix: Name prefix
+    :type prefix: str
+
+    :param size: Maximum number of documents
+    :type size: int
+
+    :param index: Index name
+    :type index: str
+
+    :param doc_type: Document type
+    :type doc_type: str
+
+    :param contexts: Category contexts values by name (optional)
+    :type contexts: dict
+
+    :param fields: Source fields to return (optional, all if None)
+    :type fields: list
+
+    :return: Suggested documents
+    :rtype: list
+    """
+
+    completion = {
+        'field': SUGGEST_FIELDS[doc_type],
+        'size': size
+    }
+
+    if contexts:
+        completion['contexts'] = contexts
+
+    response = current_app.els_client.search(
+        index=index,
+        doc_type=doc_type,
+        body={
+            'size': 0,
+            '_source': fields if fields is not None else {'excludes': [SUGGEST_FIELDS[doc_type], 'PasswordHash']},
+            'suggest': {
+                'names': {
+                    'prefix': prefix,
+                    'completion': completion
+                }
+            }
+        }
+    )
+
+    documents = OrderedDict()
+    for option in response['suggest']['names'][0]['options']:
+        if option['_id'] not in documents:
+            documents[option['_id']] = Result(option)
+
+    return list(documents.values())
+
+
+def has_suggest_field(index, doc_type):
+    """
+    Return True if completion field of document type is mapped in index
+
+    :param index: Index name
+    :type index: str
+
+    :param doc_type: Document type
+    :type doc_type: str
+
+    :return: Mapping state, False until index is reindexed with completion fields
+    :rtype: bool
+    """
+
+    field = SUGGEST_FIELDS[doc_type]
+    response = current_app.els_client.indices.get_field_mapping(index=index, doc_type=doc_type, fields=field)
+
+    for index_mappings in response.values():
+        mapping = index_mappings.get('mappings', {}).get(doc_type, {}).get(field)
+
+        if mapping is None or mapping['mapping'][field].get('type') != 'completion':
+            return False
+
+    return len(response) > 0
+
+
+def suggest_customers(prefix, size=10, fields=None, index='rastarockets_customers'):
+    """
+    Return suggested customers from prefix
+
+    :param prefix: Prefix of customer name
+    :type prefix: str
+
+    :param size: Maximum number of results (optional)
+    :type size: int
+
+    :param fields: Source fields to return (optional, all if None)
+    :type fields: list
+
+    :param index: Index name (optional)
+    :type index: str
+
+    :return: List of suggested customers
+    :rtype: list
+    """
+
+    return [Customer(document) for document in suggest_documents(prefix, size, index, 'customer', fields=fields)]
+
+
+def get_contact_from_id(contact_id, fields=None, index='rastarockets_customers'):
     """
     Return contact from unique ID
 
     :param contact_id: Contact unique ID
     :type contact_id: str
 
+    :param fields: Source fields to return (optional, all if None)
+    :type fields: list
+
     :param index: Index name (optional)
     :type index: str
 
     :return: Contact if exist
     :rtype: Contact|None
     """
-    search = Search(
-        using=current_app.els_client,
-        index=index,
-        doc_type='contact'
-    ).query('term', _id=contact_id)
+    document = get_document(contact_id, index, 'contact', fields)
 
-    response = search.execute()
-
-    if response.hits.total > 0:
-        return CustomerContact(response.hits[0])
+    if document is not None:
+        return CustomerContact(document)
 
     else:
         return None
 
 
-def get_possible_contacts(prefix, customer_id=None, index='rastarockets_customers'):
+def get_contacts_from_ids(contact_ids, fields=None, index='rastarockets_customers'):
+    """
+    Return contacts from unique IDs with one multi GET
+
+    :param contact_ids: Contacts unique IDs
+    :type contact_ids: list
+
+    :param fields: Source fields to return (optional, all if None)
+    :type fields: list
+
+    :param index: Index name (optional)
+    :type index: str
+
+    :return: Found contacts by unique ID
+    :rtype: dict
+    """
+
+    return dict(
+        (document.meta.id, CustomerContact(document))
+        for document in get_documents(contact_ids, index, 'contact', fields)
+    )
+
+
+def get_possible_contacts(prefix, customer_id=None, size=10, fields=None, index='rastarockets_customers'):
     """
     Return possible contacts from prefix
 
@@ -467,6 +1282,12 @@ def get_possible_contacts(prefix, customer_id=None, index='rastarockets_customer
     :param customer_id: Customer ID
     :type customer_id: str|None
 
+    :param size: Maximum number of results (optional)
+    :type size: int
+
+    :param fields: Source fields to return (optional, all if None)
+    :type fields: list
+
     :param index: Index name (optional)
     :type index: str
 
@@ -480,10 +1301,15 @@ def get_possible_contacts(prefix, customer_id=None, index='rastarockets_customer
         using=current_app.els_client,
         index=index,
         doc_type='contact'
-    ).query('match', Name=prefix)
+    ).query('match', Name={'query': prefix, 'operator': 'and'})
 
     if customer_id is not None:
-        search = search.query('match_phrase', Customer=customer_id)
+        search = search.filter('term', Customer=customer_id)
+
+    search = search[0:size]
+
+    if fields is not None:
+        search = search.source(fields)
 
     response = search.execute()
 
@@ -493,41 +1319,210 @@ def get_possible_contacts(prefix, customer_id=None, index='rastarockets_customer
     return contacts
 
 
-def get_consultant_from_id(consultant_id, index='rastarockets_users'):
+def suggest_contacts(prefix, customer_id=None, size=10, fields=None, index='rastarockets_customers'):
+    """
+    Return suggested contacts from prefix
+
+    :param prefix: Prefix of contact name
+    :type prefix: str
+
+    :param customer_id: Customer ID (optional)
+    :type customer_id: str|None
+
+    :param size: Maximum number of results (optional)
+    :type size: int
+
+    :param fields: Source fields to return (optional, all if None)
+    :type fields: list
+
+    :param index: Index name (optional)
+    :type index: str
+
+    :return: List of suggested contacts
+    :rtype: list
+    """
+
+    contexts = None
+    if customer_id is not None:
+        contexts = {'customer': [customer_id]}
+
+    return [CustomerContact(document) for document in suggest_documents(prefix, size, index, 'contact', contexts, fields)]
+
+
+def get_consultant_from_id(consultant_id, fields=None, index='rastarockets_users'):
     """
     Return consultant from unique ID
 
     :param consultant_id: Consultant unique ID
     :type consultant_id: str
 
+    :param fields: Source fields to return (optional, all if None)
+    :type fields: list
+
     :param index: Index name (optional)
     :type index: str
 
     :return: User if exist
     :rtype: User|None
     """
+    document = get_document(consultant_id, index, 'user', with_role(fields))
+
+    if document is not None and document.Role == 'consultant':
+        return User(document)
+
+    else:
+        return None
+
+
+def get_consultants_from_ids(consultant_ids, fields=None, index='rastarockets_users'):
+    """
+    Return consultants from unique IDs with one multi GET
+
+    :param consultant_ids: Consultants unique IDs
+    :type consultant_ids: list
+
+    :param fields: Source fields to return (optional, all if None)
+    :type fields: list
+
+    :param index: Index name (optional)
+    :type index: str
+
+    :return: Found consultants by unique ID
+    :rtype: dict
+    """
+
+    return dict(
+        (document.meta.id, User(document))
+        for document in get_documents(consultant_ids, index, 'user', with_role(fields))
+        if document.Role == 'consultant'
+    )
+
+
+def suggest_consultants(prefix, size=10, fields=None, index='rastarockets_users'):
+    """
+    Return suggested consultants from prefix
+
+    :param prefix: Prefix of consultant name
+    :type prefix: str
+
+    :param size: Maximum number of results (optional)
+    :type size: int
+
+    :param fields: Source fields to return (optional, all if None)
+    :type fields: list
+
+    :param index: Index name (optional)
+    :type index: str
+
+    :return: List of suggested consultants
+    :rtype: list
+    """
+
+    contexts = {'role': ['consultant']}
+
+    return [User(document) for document in suggest_documents(prefix, size, index, 'user', contexts, with_role(fields))]
+
+
+def scan_consultant_versions(index='rastarockets_users'):
+    """
+    Return version of all consultants, with scroll API and without source
+
+    :param index: Index name (optional)
+    :type index: str
+
+    :return: Version by consultant unique ID
+    :rtype: dict
+    """
+
     search = Search(
         using=current_app.els_client,
         index=index,
         doc_type='user'
-    ).query('term', _id=consultant_id).query('match_phrase', Role='consultant')
+    ).filter('term', Role='consultant').source(False).extra(version=True)
 
-    response = search.execute()
+    return dict((consultant.meta.id, consultant.meta.version) for consultant in search.scan())
 
-    if response.hits.total > 0:
-        return User(response.hits[0])
 
-    else:
-        return None
+def get_need_references(customer_ids=(), contact_ids=(), consultant_ids=(), fields=None,
+                        customers_index='rastarockets_customers', users_index='rastarockets_users'):
+    """
+    Return customers, contacts and consultants referenced by needs,
+    with one multi GET over both indices
 
+    :param customer_ids: Customers unique IDs (optional)
+    :type customer_ids: list
 
-def get_possible_consultants(prefix, index='rastarockets_users'):
+    :param contact_ids: Contacts unique IDs (optional)
+    :type contact_ids: list
+
+    :param consultant_ids: Consultants unique IDs (optional)
+    :type consultant_ids: list
+
+    :param fields: Source fields to return by document type (optional, all if None)
+    :type fields: dict
+
+    :param customers_index: Customers index name (optional)
+    :type customers_index: str
+
+    :param users_index: Users index name (optional)
+    :type users_index: str
+
+    :return: Found customers, contacts and consultants by unique ID
+    :rtype: tuple
+    """
+
+    customers = {}
+    contacts = {}
+    consultants = {}
+
+    docs = OrderedDict()
+    for doc_type, index, doc_ids in (('customer', customers_index, customer_ids),
+                                     ('contact', customers_index, contact_ids),
+                                     ('user', users_index, consultant_ids)):
+        for doc_id in doc_ids:
+            if doc_id:
+                docs[(doc_type, doc_id)] = {'_index': index, '_type': doc_type, '_id': doc_id}
+
+                if fields is not None and doc_type in fields:
+                    doc_fields = fields[doc_type]
+                    docs[(doc_type, doc_id)]['_source'] = with_role(doc_fields) if doc_type == 'user' else doc_fields
+
+    if len(docs) == 0:
+        return customers, contacts, consultants
+
+    response = current_app.els_client.mget(body={'docs': list(docs.values())})
+
+    for doc in response['docs']:
+        if not doc.get('found'):
+            continue
+
+        document = Result(doc)
+
+        if doc['_type'] == 'customer':
+            customers[doc['_id']] = Customer(document)
+
+        elif doc['_type'] == 'contact':
+            contacts[doc['_id']] = CustomerContact(document)
+
+        elif document.Role == 'consultant':
+            consultants[doc['_id']] = User(document)
+
+    return customers, contacts, consultants
+
+
+def get_possible_consultants(prefix, size=10, fields=None, index='rastarockets_users'):
     """
     Return possible consultants from prefix
 
     :param prefix: Prefix of consultant name
     :type prefix: str
 
+    :param size: Maximum number of results (optional)
+    :type size: int
+
+    :param fields: Source fields to return (optional, all if None)
+    :type fields: list
+
     :param index: Index name (optional)
     :type index: str
 
@@ -541,7 +1536,12 @@ def get_possible_consultants(prefix, index='rastarockets_users'):
         using=current_app.els_client,
         index=index,
         doc_type='user'
-    ).query('match', Name=prefix).query('match_phrase', Role='consultant')
+    ).query('match', Name=prefix).filter('term', Role='consultant')
+
+    search = search[0:size]
+
+    if fields is not None:
+        search = search.source(fields)
 
     response = search.execute()
 
@@ -549,3 +1549,24 @@ def get_possible_consultants(prefix, index='rastarockets_users'):
         consultants.append(User(consultant))
 
     return consultants
+
+
+def get_index_write_marker(index):
+    """
+    Return value changing each time index documents are written
+
+    :param index: Index name
+    :type index: str
+
+    :return: Indexing and deletion operations counts with documents count
+    :rtype: tuple
+    """
+
+    response = current_app.els_client.indices.stats(index=index, metric='indexing,docs')
+    primaries = response['_all']['primaries']
+
+    return (
+        primaries['indexing']['index_total'],
+        primaries['indexing']['delete_total'],
+        primaries['docs']['count']
+    )
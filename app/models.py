@@ -4,6 +4,28 @@ from itsdangerous import (TimedJSONWebSignatureSerializer as Serializer, BadSign
 from flask import current_app
 from .utils import hash_sha256
 
+_serializers = {}
+
+
+def get_serializer(expiration=None):
+    """
+    Return token serializer, built once per secret key and expiration
+
+    :param expiration: Token expiration (optional)
+    :type expiration: int
+
+    :return: Serializer
+    :rtype: Serializer
+    """
+    key = (current_app.config['SECRET_KEY'], expiration)
+    serializer = _serializers.get(key)
+
+    if serializer is None:
+        serializer = Serializer(current_app.config['SECRET_KEY'], expires_in=expiration)
+        _serializers[key] = serializer
+
+    return serializer
+
 
 class User:
     """
@@ -19,9 +41,9 @@ class User:
         :type els_object: object
         """
         self._id = els_object.meta.id
-        self._email = els_object.Email
-        self._name = els_object.Name
-        self._role = els_object.Role
+        self._email = getattr(els_object, 'Email', None)
+        self._name = getattr(els_object, 'Name', None)
+        self._role = getattr(els_object, 'Role', None)
 
         if hasattr(els_object, 'PasswordHash'):
             self._password_hash = els_object.PasswordHash
@@ -91,33 +113,124 @@ class User:
         if expiration is None:
             expiration = current_app.config['TOKEN_EXPIRATION_TIME']
 
-        serializer = Serializer(current_app.config['SECRET_KEY'], expires_in=expiration)
+        serializer = get_serializer(expiration)
 
-        return serializer.dumps({'id': self._id})
+        return serializer.dumps({'id': self._id, 'name': self._name, 'role': self._role})
 
     @staticmethod
     def verify_auth_token(token):
         """
-        Return user form token
+        Return user claims from token
 
         :param token: Token
         :type token: str
 
-        :return: User if valid token, else None
-        :rtype: User|None
+        :return: Claims (id, and name and role for recent tokens) if valid token, else None
+        :rtype: dict|None
         """
-        serializer = Serializer(current_app.config['SECRET_KEY'])
+        digest = hash_sha256(token)
+        reason = current_app.rejected_tokens.get(digest)
 
-        try:
-            data = serializer.loads(token)
-        except SignatureExpired:
-            print('SignatureExpired')
-            return None
-        except BadSignature:
-            print('BadSignature')
+        if reason is None:
+            serializer = get_serializer()
+
+            try:
+                return serializer.loads(token)
+            except SignatureExpired:
+                reason = 'expired'
+            except BadSignature:
+                reason = 'bad_signature'
+
+            current_app.rejected_tokens.set(digest, reason)
+
+        current_app.token_rejections.increment(reason)
+        return None
+
+    def __eq__(self, other):
+        return self._id == other.id
+
+
+class Principal:
+    """
+    Represent authenticated user,
+    slim copy of User kept in auth cache
+    """
+
+    def __init__(self, user_id, name, role):
+        """
+        Constructor
+
+        :param user_id: User unique ID
+        :type user_id: str
+
+        :param name: User name
+        :type name: str
+
+        :param role: User role
+        :type role: str
+        """
+        self._id = user_id
+        self._name = name
+        self._role = role
+
+    @classmethod
+    def from_user(cls, user):
+        """
+        Build principal from user
+
+        :param user: User
+        :type user: User
+
+        :return: Principal
+        :rtype: Principal
+        """
+        return cls(user.id, user.name, user.role)
+
+    @classmethod
+    def from_claims(cls, claims):
+        """
+        Build principal from token claims
+
+        :param claims: Verified token claims
+        :type claims: dict
+
+        :return: Principal if claims are complete, else None
+        :rtype: Principal|None
+        """
+        if 'name' not in claims or 'role' not in claims:
             return None
 
-        return data['id']
+        return cls(claims['id'], claims['name'], claims['role'])
+
+    @property
+    def id(self):
+        """
+        Return user unique ID
+
+        :return: ID
+        :rtype: str
+        """
+        return self._id
+
+    @property
+    def name(self):
+        """
+        Return user name
+
+        :return: User name
+        :rtype: str
+        """
+        return self._name
+
+    @property
+    def role(self):
+        """
+        Return role of user
+
+        :return: Role
+        :rtype: str
+        """
+        return self._role
 
     def __eq__(self, other):
         return self._id == other.id
@@ -136,12 +249,13 @@ class Need:
         :type els_object: object
         """
         self._id = els_object.meta.id
-        self._author = els_object.Author
-        self._title = els_object.Title
-        self._created_at = els_object.CreatedAt
-        self._contact = els_object.Contact
-        self._customer = els_object.Customer
-        self._status = els_object.Status
+        self._version = getattr(els_object.meta, 'version', None)
+        self._author = getattr(els_object, 'Author', None)
+        self._title = getattr(els_object, 'Title', None)
+        self._created_at = getattr(els_object, 'CreatedAt', None)
+        self._contact = getattr(els_object, 'Contact', None)
+        self._customer = getattr(els_object, 'Customer', None)
+        self._status = getattr(els_object, 'Status', None)
 
         if hasattr(els_object, 'StartAtLatest'):
             self._start_at_latest = els_object.StartAtLatest
@@ -193,6 +307,16 @@ class Need:
         """
         return self._id
 
+    @property
+    def version(self):
+        """
+        Return document version, if known
+
+        :return: Version
+        :rtype: int|None
+        """
+        return self._version
+
     @property
     def author(self):
         """
@@ -337,7 +461,7 @@ class CustomerContact:
         """
         self._id = els_object.meta.id
         self._name = els_object.Name
-        self._email = els_object.Email
+        self._email = getattr(els_object, 'Email', None)
 
     @property
     def id(self):
@@ -383,6 +507,7 @@ class NeedContent:
         :type els_object: object
         """
         self._id = els_object.meta.id
+        self._version = getattr(els_object.meta, 'version', None)
         self._need = els_object.Need
         self._filename = els_object.Filename
 
@@ -396,6 +521,16 @@ class NeedContent:
         """
         return self._id
 
+    @property
+    def version(self):
+        """
+        Return document version, if known
+
+        :return: Version
+        :rtype: int|None
+        """
+        return self._version
+
     @property
     def need(self):
         """
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from threading import Lock
+
+
+def fold(text):
+    """
+    Return text without accents, lowercase and with collapsed spaces
+
+    :param text: Text
+    :type text: str
+
+    :return: Folded text
+    :rtype: str
+    """
+    decomposed = unicodedata.normalize('NFKD', text)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+    return ' '.join(stripped.lower().split())
+
+
+class PrefixIndex:
+    """
+    Sorted array of folded names and name words,
+    searched by prefix with bisect and updated in place
+    """
+
+    def __init__(self, entries=()):
+        """
+        Constructor
+
+        :param entries: Indexed objects, with id and name attributes
+        :type entries: list
+        """
+        self._entries = {}
+        self._keys = []
+
+        for entry in entries:
+            self.add(entry)
+
+    @staticmethod
+    def _get_keys(entry):
+        """
+        Return sorted array items of entry: whole name then each following word
+
+        :param entry: Indexed object
+        :type entry: object
+
+        :return: (key, folded name, id) items, none for entry without name
+        :rtype: list
+        """
+        if not entry.name:
+            return []
+
+        name = fold(entry.name)
+        words = name.split(' ')
+
+        return [(key, name, entry.id) for key in set([name] + words[1:])]
+
+    def add(self, entry):
+        """
+        Add or replace entry
+
+        :param entry: Indexed object, with id and name attributes
+        :type entry: object
+        """
+        self.remove(entry.id)
+        self._entries[entry.id] = entry
+
+        for item in self._get_keys(entry):
+            insort(self._keys, item)
+
+    def remove(self, entry_id):
+        """
+        Remove entry if present
+
+        :param entry_id: Entry unique ID
+        :type entry_id: str
+        """
+        entry = self._entries.pop(entry_id, None)
+
+        if entry is None:
+            return
+
+        for item in self._get_keys(entry):
+            i = bisect_left(self._keys, item)
+            if i < len(self._keys) and self._keys[i] == item:
+                del self._keys[i]
+
+    def search(self, prefix, limit=10):
+        """
+        Return entries with name or one of its words starting with prefix
+
+        :param prefix: Name prefix
+        :type prefix: str
+
+        :param limit: Maximum number of entries (optional)
+        :type limit: int
+
+        :return: Matching entries, sorted by name
+        :rtype: list
+        """
+        prefix = fold(prefix)
+        matches = set()
+
+        i = bisect_left(self._keys, (prefix,))
+        while i < len(self._keys) and self._keys[i][0].startswith(prefix):
+            matches.add(self._keys[i][1:])
+            i += 1
+
+        return [self._entries[entry_id] for _, entry_id in sorted(matches)[:limit]]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class PollingPrefixIndex:
+    """
+    Prefix index kept in sync with its source by a poller,
+    only documents whose version changed are fetched and applied
+    """
+
+    def __init__(self, load_versions, load_documents, marker, max_age, batch_size=1000, timer=time.monotonic):
+        """
+        Constructor
+
+        :param load_versions: Function returning version of each source document by unique ID
+        :type load_versions: callable
+
+        :param load_documents: Function returning source documents from unique IDs
+        :type load_documents: callable
+
+        :param marker: Function returning value that change when source is written
+        :type marker: callable
+
+        :param max_age: Delay after which index without successful refresh is stale (seconds)
+        :type max_age: float
+
+        :param batch_size: Number of documents fetched by load_documents call (optional)
+        :type batch_size: int
+
+        :param timer: Clock function (optional)
+        :type timer: callable
+        """
+        self._load_versions = load_versions
+        self._load_documents = load_documents
+        self._marker = marker
+        self._max_age = max_age
+        self._batch_size = batch_size
+        self._timer = timer
+        self._lock = Lock()
+        self._index = None
+        self._versions = {}
+        self._current_marker = None
+        self._last_success = None
+
+    def refresh(self):
+        """
+        Apply source changes since last refresh, called from poller thread only
+        """
+        marker = self._marker()
+
+        if self._index is None or marker != self._current_marker:
+            versions = self._load_versions()
+            changed = [doc_id for doc_id, version in versions.items() if self._versions.get(doc_id) != version]
+            removed = [doc_id for doc_id in self._versions if doc_id not in versions]
+
+            documents = []
+            for i in range(0, len(changed), self._batch_size):
+                documents.extend(self._load_documents(changed[i:i + self._batch_size]))
+
+            # Documents gone between the two reads are retried on next refresh
+            found = set(document.id for document in documents)
+            for doc_id in changed:
+                if doc_id not in found:
+                    versions.pop(doc_id)
+                    removed.append(doc_id)
+
+            with self._lock:
+                index = self._index if self._index is not None else PrefixIndex()
+
+                for doc_id in removed:
+                    index.remove(doc_id)
+
+                for document in documents:
+                    index.add(document)
+
+                self._index = index
+
+            self._versions = versions
+            self._current_marker = marker
+
+        self._last_success = self._timer()
+
+    def is_stale(self):
+        """
+        Return True if index is missing or too old to be used
+
+        :return: Stale state
+        :rtype: bool
+        """
+        return self._index is None or self._timer() - self._last_success > self._max_age
+
+    def search(self, prefix, limit=10):
+        """
+        Return entries matching prefix, None if index is stale
+
+        :param prefix: Name prefix
+        :type prefix: str
+
+        :param limit: Maximum number of entries (optional)
+        :type limit: int
+
+        :return: Matching entries if index is usable, else None
+        :rtype: list|None
+        """
+        if self.is_stale():
+            return None
+
+        with self._lock:
+            return self._index.search(prefix, limit)
+
+    def stats(self):
+        """
+        Return index statistics
+
+        :return: Size and staleness
+        :rtype: dict
+        """
+        return {
+            'size': len(self._index) if self._index is not None else 0,
+            'stale': self.is_stale()
+        }
@@ -0,0 +1,363 @@
+# -*- coding: utf-8 -*-
+
+ANALYSIS = {
+    "filter": {
+        "autocomplete_filter": {
+            "type": "edge_ngram",
+            "min_gram": 1,
+            "max_gram": 20
+        }
+    },
+    "analyzer": {
+        "autocomplete": {
+            "type": "custom",
+            "tokenizer": "standard",
+            "filter": [
+                "lowercase",
+                "autocomplete_filter"
+            ]
+        },
+        "suggest": {
+            "type": "custom",
+            "tokenizer": "keyword",
+            "filter": [
+                "lowercase",
+                "asciifolding"
+            ]
+        }
+    },
+    "normalizer": {
+        "lowercase_keyword": {
+            "type": "custom",
+            "filter": [
+                "lowercase"
+            ]
+        }
+    }
+}
+
+AUTOCOMPLETE_TEXT = {
+    'type': 'text',
+    'analyzer': 'autocomplete',
+    'search_analyzer': 'standard'
+}
+
+KEYWORD = {'type': 'keyword'}
+
+# Case insensitive exact value, such as email addresses
+LOWERCASE_KEYWORD = {'type': 'keyword', 'normalizer': 'lowercase_keyword'}
+
+
+def completion(contexts=None):
+    """
+    Return completion suggester field mapping
+
+    :param contexts: Category contexts as name, path pairs (optional)
+    :type contexts: list
+
+    :return: Field mapping
+    :rtype: dict
+    """
+    mapping = {
+        'type': 'completion',
+        'analyzer': 'suggest',
+        'preserve_separators': True
+    }
+
+    if contexts:
+        mapping['contexts'] = [{'name': name, 'type': 'category', 'path': path} for name, path in contexts]
+
+    return mapping
+
+
+# Completion field of each document type. Types of one index cannot share a completion
+# field with different contexts, and a shared field would suggest documents of both types.
+SUGGEST_FIELDS = {
+    'user': 'NameSuggest',
+    'customer': 'CustomerSuggest',
+    'contact': 'ContactSuggest'
+}
+
+# Fill completion field of reindexed documents (params.fields is SUGGEST_FIELDS),
+# same inputs as get_name_suggest
+NAME_SUGGEST_SCRIPT = (
+    "if (ctx._source.Name != null && params.fields.containsKey(ctx._type)) {"
+    " String name = ctx._source.Name;"
+    " List input = new ArrayList();"
+    " input.add(name);"
+    " int i = name.indexOf(' ');"
+    " while (i >= 0) {"
+    "  if (i + 1 < name.length() && name.charAt(i + 1) != (char) ' ') { input.add(name.substring(i + 1)); }"
+    "  i = name.indexOf(' ', i + 1);"
+    " }"
+    " ctx._source[params.fields[ctx._type]] = ['input': input];"
+    "}"
+)
+
+# Index definitions by alias, applications only use the alias name.
+# Bump version when a definition change, then reindex the alias.
+SCHEMAS = {
+    'rastarockets_users': {
+        'version': 3,
+        'reindex_script': NAME_SUGGEST_SCRIPT,
+        'mappings': {
+            'user': {
+                'properties': {
+                    'Name': AUTOCOMPLETE_TEXT,
+                    'NameSuggest': completion([('role', 'Role')]),
+                    'Email': LOWERCASE_KEYWORD,
+                    'PasswordHash': {'type': 'keyword', 'index': False, 'doc_values': False},
+                    'Role': KEYWORD
+                }
+            }
+        }
+    },
+    'rastarockets_customers': {
+        'version': 3,
+        'reindex_script': NAME_SUGGEST_SCRIPT,
+        'mappings': {
+            'customer': {
+                'properties': {
+                    'Name': AUTOCOMPLETE_TEXT,
+                    'CustomerSuggest': completion()
+                }
+            },
+            'contact': {
+                'properties': {
+                    'Customer': KEYWORD,
+                    'Name': AUTOCOMPLETE_TEXT,
+                    'ContactSuggest': completion([('customer', 'Customer')]),
+                    'Email': LOWERCASE_KEYWORD
+                }
+            }
+        }
+    },
+    'rastarockets_needs': {
+        'version': 1,
+        'mappings': {
+            'need': {
+                'properties': {
+                    'CreatedAt': {'type': 'date'},
+                    'Author': KEYWORD,
+                    'Customer': KEYWORD,
+                    'Contact': KEYWORD,
+                    'Title': AUTOCOMPLETE_TEXT,
+                    'Description': {'type': 'text'},
+                    'SuccessKeys': {
+                        'type': 'nested',
+                        'properties': {
+                            'Key': {'type': 'text'}
+                        }
+                    },
+                    'StartAtLatest': {'type': 'date'},
+                    'MonthDuration': {'type': 'float'},
+                    'WeekFrequency': {'type': 'float'},
+                    'Rate': {'type': 'float'},
+                    'Consultants': {
+                        'type': 'nested',
+                        'properties': {
+                            'Id': KEYWORD
+                        }
+                    },
+                    'Status': KEYWORD
+                }
+            },
+            'content': {
+                'properties': {
+                    'Need': KEYWORD,
+                    'Filename': KEYWORD
+                }
+            }
+        }
+    }
+}
+
+
+def get_name_suggest(name):
+    """
+    Return completion suggester value of name,
+    whole name and each word suffix so any word can start the suggestion
+
+    :param name: Name
+    :type name: str
+
+    :return: Completion field value (see SUGGEST_FIELDS)
+    :rtype: dict
+    """
+
+    words = name.split(' ')
+    inputs = [name]
+
+    for i in range(1, len(words)):
+        if words[i]:
+            inputs.append(' '.join(words[i:]))
+
+    return {'input': inputs}
+
+
+def get_index_name(alias, version=None):
+    """
+    Return concrete index name of schema version
+
+    :param alias: Alias name
+    :type alias: str
+
+    :param version: Schema version (optional, current if None)
+    :type version: int
+
+    :return: Index name
+    :rtype: str
+    """
+
+    if version is None:
+        version = SCHEMAS[alias]['version']
+
+    return '{0}_v{1}'.format(alias, version)
+
+
+def get_index_body(alias):
+    """
+    Return index creation body of current schema version
+
+    :param alias: Alias name
+    :type alias: str
+
+    :return: Index body
+    :rtype: dict
+    """
+
+    return {
+        'settings': {
+            'number_of_shards': 1,
+            'number_of_replicas': 0,
+            'analysis': ANALYSIS
+        },
+        'mappings': SCHEMAS[alias]['mappings']
+    }
+
+
+def get_alias_indices(client, alias):
+    """
+    Return concrete indices behind alias
+
+    :param client: Elasticsearch client
+    :type client: Elasticsearch
+
+    :param alias: Alias name
+    :type alias: str
+
+    :return: Indices names
+    :rtype: list
+    """
+
+    if not client.indices.exists_alias(name=alias):
+        return []
+
+    return list(client.indices.get_alias(name=alias).keys())
+
+
+def ensure_index(client, alias):
+    """
+    Create current index version with its alias if alias does not exist
+
+    :param client: Elasticsearch client
+    :type client: Elasticsearch
+
+    :param alias: Alias name
+    :type alias: str
+
+    :return: True if index has been created
+    :rtype: bool
+    """
+
+    if client.indices.exists(index=alias):
+        return False
+
+    body = get_index_body(alias)
+    body['aliases'] = {alias: {}}
+
+    client.indices.create(index=get_index_name(alias), body=body)
+
+    return True
+
+
+def reindex(client, alias, script=None):
+    """
+    Copy documents behind alias to current index version, then swap alias.
+    Reads and writes keep going to old index until the swap. Old index is write blocked
+    for the last copy pass, writes made meanwhile are rejected instead of lost.
+    Deletes made during a copy are not carried over to the new index.
+
+    :param client: Elasticsearch client
+    :type client: Elasticsearch
+
+    :param alias: Alias name
+    :type alias: str
+
+    :param script: Painless script applied to each document (optional, schema script if None)
+    :type script: str
+
+    :return: New index name, None if alias already on current version
+    :rtype: str|None
+    """
+
+    if script is None:
+        script = SCHEMAS[alias].get('reindex_script')
+
+    new_index = get_index_name(alias)
+    old_indices = get_alias_indices(client, alias)
+    legacy = len(old_indices) == 0 and client.indices.exists(index=alias)
+
+    if new_index in old_indices:
+        return None
+
+    if len(old_indices) == 0 and not legacy:
+        # Nothing to copy, current version is created with its alias
+        if client.indices.exists(index=new_index):
+            client.indices.put_alias(index=new_index, name=alias)
+        else:
+            ensure_index(client, alias)
+
+        return new_index
+
+    if not client.indices.exists(index=new_index):
+        client.indices.create(index=new_index, body=get_index_body(alias))
+
+    def copy(source):
+        # External versioning keeps the newest copy, a second pass only brings late writes
+        body = {
+            'conflicts': 'proceed',
+            'source': {'index': source},
+            'dest': {'index': new_index, 'version_type': 'external'}
+        }
+
+        if script is not None:
+            body['script'] = {'inline': script, 'lang': 'painless', 'params': {'fields': SUGGEST_FIELDS}}
+
+        client.reindex(body=body, wait_for_completion=True, refresh=True, request_timeout=3600)
+
+    copy(alias)
+
+    if legacy:
+        # Second pass brings writes made during the first copy, none can follow it
+        client.indices.put_settings(index=alias, body={'index.blocks.write': True})
+        copy(alias)
+
+        # Unversioned index holds the alias name. Removing it and adding the alias in one
+        # atomic action leaves no gap where a write would auto-create an index.
+        client.indices.update_aliases(body={'actions': [
+            {'add': {'index': new_index, 'alias': alias}},
+            {'remove_index': {'index': alias}}
+        ]})
+
+    else:
+        actions = [{'remove': {'index': index, 'alias': alias}} for index in old_indices]
+        actions.append({'add': {'index': new_index, 'alias': alias}})
+
+        client.indices.update_aliases(body={'actions': actions})
+
+        # Second pass brings writes that reached old indices before the swap
+        client.indices.put_settings(index=','.join(old_indices), body={'index.blocks.write': True})
+        copy(old_indices)
+
+    return new_index
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+from collections import Counter
+from threading import Lock
+
+
+class Counters:
+    """
+    Thread safe named counters
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self._counter = Counter()
+        self._lock = Lock()
+
+    def increment(self, name, value=1):
+        """
+        Increment counter
+
+        :param name: Counter name
+        :type name: str
+
+        :param value: Increment (optional)
+        :type value: int
+        """
+        with self._lock:
+            self._counter[name] += value
+
+    def get(self, name):
+        """
+        Return counter value
+
+        :param name: Counter name
+        :type name: str
+
+        :return: Value
+        :rtype: int
+        """
+        with self._lock:
+            return self._counter[name]
+
+    def as_dict(self):
+        """
+        Return snapshot of all counters
+
+        :return: Counters values
+        :rtype: dict
+        """
+        with self._lock:
+            return dict(self._counter)
+
+
+def get_connection_pool_stats(client):
+    """
+    Return HTTP connection pools utilisation of Elasticsearch client
+
+    :param client: Elasticsearch client
+    :type client: Elasticsearch
+
+    :return: Pool statistics by node
+    :rtype: list
+    """
+    nodes = []
+
+    for connection in client.transport.connection_pool.connections:
+        pool = connection.pool
+        available = pool.pool.qsize() if pool.pool is not None else 0
+
+        nodes.append({
+            'host': connection.host,
+            'maxsize': pool.maxsize,
+            'in_use': pool.maxsize - available,
+            'connections_created': pool.num_connections,
+            'requests': pool.num_requests
+        })
+
+    return nodes
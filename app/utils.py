@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
 
+import base64
 import hashlib
+import json
+import os
+from threading import Thread
 
 
 def hash_sha256(content):
@@ -67,3 +71,75 @@ def allowed_file(config, filename):
     """
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in config
+
+
+def remove_files(folder, filenames):
+    """
+    Remove files of folder, missing files are ignored
+
+    :param folder: Folder path
+    :type folder: str
+
+    :param filenames: Filenames
+    :type filenames: list
+    """
+    for filename in filenames:
+        path = os.path.join(folder, filename)
+
+        if os.path.isfile(path):
+            os.remove(path)
+
+
+def remove_files_in_background(folder, filenames):
+    """
+    Remove files of folder in a background thread
+
+    :param folder: Folder path
+    :type folder: str
+
+    :param filenames: Filenames
+    :type filenames: list
+    """
+    if len(filenames) > 0:
+        Thread(target=remove_files, args=(folder, list(filenames)), daemon=True).start()
+
+
+def encode_cursor(values, query):
+    """
+    Encode pagination sort values as opaque cursor, bound to the query they were returned for
+
+    :param values: Sort values
+    :type values: list
+
+    :param query: Query parameters of paginated search
+    :type query: list
+
+    :return: Cursor
+    :rtype: str
+    """
+    state = {'sort': values, 'query': query}
+
+    return base64.urlsafe_b64encode(json.dumps(state).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor, query):
+    """
+    Decode opaque cursor to pagination sort values
+
+    :param cursor: Cursor
+    :type cursor: str
+
+    :param query: Query parameters of paginated search, must match those of encoded cursor
+    :type query: list
+
+    :return: Sort values
+    :rtype: list
+
+    :raise ValueError: If cursor is invalid or was returned for another query
+    """
+    state = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+
+    if not isinstance(state, dict) or not isinstance(state.get('sort'), list) or state.get('query') != query:
+        raise ValueError('Invalid cursor')
+
+    return state['sort']
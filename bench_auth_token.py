@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+import timeit
+from itsdangerous import TimedJSONWebSignatureSerializer as Serializer
+from app import create_app
+from app.elastic import get_user_from_email, get_user_from_id
+from app.models import User, Principal
+
+
+ITERATIONS = 1000
+
+
+def verify_legacy(app, token):
+    """
+    Token verification before self-contained tokens:
+    new serializer on each call, then user read from Elasticsearch
+    """
+    serializer = Serializer(app.config['SECRET_KEY'])
+    data = serializer.loads(token)
+    return Principal.from_user(get_user_from_id(data['id']))
+
+
+def verify_claims(token):
+    """
+    Token verification with shared serializer and signed claims
+    """
+    return Principal.from_claims(User.verify_auth_token(token))
+
+
+if __name__ == '__main__':
+    app = create_app('default')
+
+    with app.app_context():
+        user = get_user_from_email('averdier@gfi.fr')
+
+        if not user:
+            raise SystemExit('run temp_add_user.py first')
+
+        token = user.generate_auth_token()
+
+        legacy = timeit.timeit(lambda: verify_legacy(app, token), number=ITERATIONS)
+        claims = timeit.timeit(lambda: verify_claims(token), number=ITERATIONS)
+
+    print('legacy: {0:.0f} verify/s'.format(ITERATIONS / legacy))
+    print('claims: {0:.0f} verify/s'.format(ITERATIONS / claims))
+    print('speedup: x{0:.1f}'.format(legacy / claims))
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+import random
+import timeit
+from elasticsearch import Elasticsearch, helpers
+from config import config
+from app.schemas import get_index_body
+
+
+INDEX = 'bench_needs_filters'
+DOCUMENTS = 100000
+AUTHORS = 200
+CUSTOMERS = 50
+ITERATIONS = 200
+
+TITLES = ['Java developer', 'Python developer', 'Project manager', 'Scrum master', 'Data engineer',
+          'DevOps engineer', 'Business analyst', 'Frontend developer', 'Architect', 'Tester']
+
+
+def generate_needs():
+    """
+    Yield synthetic needs bulk actions
+    """
+    for i in range(DOCUMENTS):
+        yield {
+            '_index': INDEX,
+            '_type': 'need',
+            '_source': {
+                'CreatedAt': '2017-{0:02d}-{1:02d}T10:00:00'.format(i % 12 + 1, i % 28 + 1),
+                'Author': 'author-{0}'.format(random.randrange(AUTHORS)),
+                'Customer': 'customer-{0}'.format(random.randrange(CUSTOMERS)),
+                'Contact': 'contact-{0}'.format(random.randrange(CUSTOMERS * 4)),
+                'Title': random.choice(TITLES),
+                'Status': random.choice(['open', 'win', 'lost'])
+            }
+        }
+
+
+def scored_query(author, status, customer, title):
+    """
+    Query before filter context: every constraint is scored
+    """
+    return {'query': {'bool': {'must': [
+        {'match_phrase': {'Author': author}},
+        {'match_phrase': {'Status': status}},
+        {'match_phrase': {'Customer': customer}},
+        {'match': {'Title': title}}
+    ]}}}
+
+
+def filtered_query(author, status, customer, title):
+    """
+    Query with exact constraints in cacheable filter context
+    """
+    return {'query': {'bool': {
+        'must': [{'match': {'Title': title}}],
+        'filter': [
+            {'term': {'Author': author}},
+            {'term': {'Status': status}},
+            {'term': {'Customer': customer}}
+        ]
+    }}}
+
+
+if __name__ == '__main__':
+    app_config = config['default']
+    client = Elasticsearch([{'host': app_config.ELS_HOST, 'port': app_config.ELS_PORT}])
+
+    if client.indices.exists(index=INDEX):
+        client.indices.delete(index=INDEX)
+
+    client.indices.create(index=INDEX, body=get_index_body('rastarockets_needs'))
+    helpers.bulk(client, generate_needs())
+    client.indices.refresh(index=INDEX)
+
+    random.seed(42)
+    cases = [('author-{0}'.format(random.randrange(AUTHORS)), random.choice(['open', 'win', 'lost']),
+              'customer-{0}'.format(random.randrange(CUSTOMERS)), random.choice(TITLES)) for _ in range(10)]
+
+    try:
+        for name, build in (('scored', scored_query), ('filtered', filtered_query)):
+            def run():
+                for case in cases:
+                    client.search(index=INDEX, doc_type='need', body=build(*case), size=20)
+
+            run()  # warm caches
+            elapsed = timeit.timeit(run, number=ITERATIONS)
+
+            print('{0:<10} {1:8.3f} ms per query'.format(name, elapsed * 1000 / (ITERATIONS * len(cases))))
+
+    finally:
+        client.indices.delete(index=INDEX)
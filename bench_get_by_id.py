@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+import timeit
+from elasticsearch_dsl import Search
+from app import create_app
+from app.elastic import get_customer_from_id, get_customers_from_ids
+from app.models import Customer
+
+
+ITERATIONS = 500
+
+
+def get_customer_with_search(customer_id, index='rastarockets_customers'):
+    """
+    Customer lookup before realtime GET: term query on _id
+    """
+    search = Search(
+        using=app.els_client,
+        index=index,
+        doc_type='customer'
+    ).query('term', _id=customer_id)
+
+    response = search.execute()
+
+    if response.hits.total > 0:
+        return Customer(response.hits[0])
+
+    return None
+
+
+if __name__ == '__main__':
+    app = create_app('default')
+
+    with app.app_context():
+        response = Search(using=app.els_client, index='rastarockets_customers', doc_type='customer').execute()
+        customer_ids = [hit.meta.id for hit in response]
+
+        if len(customer_ids) == 0:
+            raise SystemExit('run temp_add_customer.py first')
+
+        def search_each():
+            for customer_id in customer_ids:
+                get_customer_with_search(customer_id)
+
+        def get_each():
+            for customer_id in customer_ids:
+                get_customer_from_id(customer_id)
+
+        def mget_all():
+            get_customers_from_ids(customer_ids)
+
+        results = [
+            ('term search', timeit.timeit(search_each, number=ITERATIONS)),
+            ('get', timeit.timeit(get_each, number=ITERATIONS)),
+            ('mget', timeit.timeit(mget_all, number=ITERATIONS))
+        ]
+
+    for name, elapsed in results:
+        print('{0:<12} {1:8.3f} ms per {2} customers'.format(name, elapsed * 1000 / ITERATIONS, len(customer_ids)))
@@ -13,6 +13,19 @@ class Config:
     CELERY_BROKER_URL = 'redis://localhost:6379/0'
     CELERY_RESULT_BACKEND = 'redis://localhost:6379/0'
     TOKEN_EXPIRATION_TIME = 600
+    PRINCIPAL_CACHE_SIZE = 1024
+    PRINCIPAL_CACHE_TTL = 300  # only bound on staleness of changed users
+    REJECTED_TOKEN_CACHE_SIZE = 4096
+    REJECTED_TOKEN_CACHE_TTL = 3600
+    AUTOCOMPLETE_CACHE_SIZE = 1024
+    AUTOCOMPLETE_CACHE_TTL = 60
+    AUTOCOMPLETE_SIZE = 10
+    AUTOCOMPLETE_MAX_SIZE = 50
+    AUTOCOMPLETE_SUGGEST = True
+    AUTOCOMPLETE_SUGGEST_CHECK_TTL = 300
+    PREFIX_INDEX_ENABLED = True
+    PREFIX_INDEX_POLL_INTERVAL = 30
+    PREFIX_INDEX_MAX_AGE = 300
     RESTPLUS_SWAGGER_UI_DOC_EXPANSION = 'list'
     RESTPLUS_VALIDATE = True
     MAIL_SERVER = 'smtp.googlemail.com'
@@ -24,6 +37,24 @@ class Config:
     DEFAULT_SENDER = "gfi@workshop.com"
     ELS_HOST = 'localhost'
     ELS_PORT = 9200
+    ELS_HOSTS = None  # list of nodes, ELS_HOST and ELS_PORT if None
+    ELS_MAXSIZE = 10
+    ELS_KEEP_ALIVE = True
+    ELS_TIMEOUT = 10
+    ELS_MAX_RETRIES = 3
+    ELS_RETRY_ON_TIMEOUT = True
+    ELS_SNIFF_ON_START = False
+    ELS_SNIFF_ON_CONNECTION_FAIL = False
+    ELS_SNIFFER_TIMEOUT = None
+    ELS_REFRESH = 'wait_for'
+    EXPORT_BATCH_SIZE = 500
+    NEED_FACETS_SIZE = 20
+    COMPRESS_MIMETYPES = {'application/json', 'text/html'}
+    COMPRESS_MIN_SIZE = 500
+    COMPRESS_LEVEL = 6
+    COMPRESS_CACHE_ENDPOINTS = {'api.specs', 'api.postman_postman_export'}
+    COMPRESS_CACHE_SIZE = 16
+    COMPRESS_CACHE_TTL = 3600
     UPLOAD_FOLDER = os.path.join(basedir, 'upload')
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg'}
 
@@ -52,6 +83,7 @@ class ProductionConfig(Config):
     Production configuration
     """
     DEBUG = False
+    ELS_REFRESH = 'false'
     RESTPLUS_MASK_SWAGGER = True
     RESTPLUS_ERROR_404_HELP = False
 
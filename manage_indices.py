@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+import sys
+from elasticsearch import Elasticsearch
+from config import config
+from app.schemas import SCHEMAS, ensure_index, reindex, get_alias_indices
+
+USAGE = '''usage: python manage_indices.py (create|reindex|status) [alias ...]
+
+reindex copies documents to the current schema version then moves the alias.
+Writes to an unversioned index are rejected during the last copy pass,
+deletes made while copying are not carried over: run it when the app is idle.'''
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] not in ('create', 'reindex', 'status'):
+        raise SystemExit(USAGE)
+
+    command = sys.argv[1]
+    aliases = sys.argv[2:] or sorted(SCHEMAS.keys())
+
+    app_config = config['default']
+    client = Elasticsearch([{'host': app_config.ELS_HOST, 'port': app_config.ELS_PORT}])
+
+    for alias in aliases:
+        if alias not in SCHEMAS:
+            raise SystemExit('unknown alias {0}'.format(alias))
+
+        if command == 'create':
+            if ensure_index(client, alias):
+                print('{0} created'.format(alias))
+            else:
+                print('{0} already exist'.format(alias))
+
+        elif command == 'reindex':
+            new_index = reindex(client, alias)
+
+            if new_index is None:
+                print('{0} already on version {1}'.format(alias, SCHEMAS[alias]['version']))
+            else:
+                print('{0} now points to {1}'.format(alias, new_index))
+
+        else:
+            indices = get_alias_indices(client, alias)
+
+            if len(indices) > 0:
+                state = ', '.join(indices)
+            elif client.indices.exists(index=alias):
+                state = 'unversioned index'
+            else:
+                state = 'missing'
+
+            print('{0} -> {1} (current version {2})'.format(alias, state, SCHEMAS[alias]['version']))
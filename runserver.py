@@ -1,16 +1,16 @@
 # -*- coding: utf-8 -*-
 
+import os
 from app import create_app
 
-app = create_app('development')
+app = create_app(os.environ.get('RASTAROCKET_CONFIG', 'development'))
 
 
 if __name__ == '__main__':
-    import os
     HOST = os.environ.get('SERVER_HOST', 'localhost')
     try:
         PORT = int(os.environ.get('SERVER_PORT', '5555'))
     except ValueError:
         PORT = 5555
 
-    app.run(HOST, PORT, debug=True)
\ No newline at end of file
+    app.run(HOST, PORT, debug=True, threaded=True)
\ No newline at end of file
@@ -3,6 +3,7 @@
 from elasticsearch import Elasticsearch, helpers
 from elasticsearch_dsl import Search
 from config import config
+from app.schemas import get_name_suggest, SUGGEST_FIELDS
 
 
 if __name__ == '__main__':
@@ -15,6 +16,7 @@ if __name__ == '__main__':
         'Name': 'Jean Bon',
         'Email': 'jeanbon@bnp.fr'
     }
+    contact[SUGGEST_FIELDS['contact']] = get_name_suggest(contact['Name'])
 
     search = Search(
         using=client,
@@ -3,6 +3,7 @@
 from elasticsearch import Elasticsearch, helpers
 from elasticsearch_dsl import Search
 from config import config
+from app.schemas import ensure_index, get_name_suggest, SUGGEST_FIELDS
 
 
 if __name__ == '__main__':
@@ -46,63 +47,7 @@ if __name__ == '__main__':
     ]
     client = Elasticsearch([{'host': app_config.ELS_HOST, 'port': app_config.ELS_PORT}])
 
-    if not client.indices.exists(indice):
-        client.indices.create(
-            index=indice,
-            body={
-                "settings": {
-                    "number_of_shards": 1,
-                    "number_of_replicas": 0,
-                    "analysis": {
-                      "filter": {
-                        "autocomplete_filter": {
-                          "type": "edge_ngram",
-                          "min_gram": 1,
-                          "max_gram": 20
-                        }
-                      },
-                      "analyzer": {
-                        "autocomplete": {
-                          "type": "custom",
-                          "tokenizer": "standard",
-                          "filter": [
-                            "lowercase",
-                            "autocomplete_filter"
-                          ]
-                        }
-                      }
-                    }
-                },
-                "mappings": {
-                    "customer": {
-                        "properties": {
-                            "Name": {
-                                "type": "text",
-                                "analyzer": "autocomplete",
-                                "search_analyzer": "standard"
-                            }
-                        }
-                    },
-                    'contact': {
-                        'properties': {
-                            'Customer': {
-                                'type': 'text'
-                            },
-                            'Name': {
-                                'type': 'text',
-                                'analyzer': 'autocomplete',
-                                'search_analyzer': 'standard'
-                            },
-                            'Email': {
-                                'type': 'text',
-                                'analyzer': 'autocomplete',
-                                'search_analyzer': 'standard'
-                            }
-                        }
-                    }
-                }
-            }
-        )
+    ensure_index(client, indice)
 
     bulk_commands = []
     for customer in customers:
@@ -116,6 +61,7 @@ if __name__ == '__main__':
         if response.hits.total == 0:
             print('{0} added to bulk'.format(customer['Name']))
 
+            customer[SUGGEST_FIELDS['customer']] = get_name_suggest(customer['Name'])
             bulk_commands.append({
                 '_type': 'customer',
                 '_index': indice,
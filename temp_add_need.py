@@ -3,6 +3,7 @@
 from datetime import datetime
 from elasticsearch import Elasticsearch
 from config import config
+from app.schemas import ensure_index
 import json
 
 
@@ -12,55 +13,4 @@ if __name__ == '__main__':
 
     client = Elasticsearch([{'host': app_config.ELS_HOST, 'port': app_config.ELS_PORT}])
 
-    if not client.indices.exists(indice):
-        client.indices.create(
-            index=indice,
-            body={
-                "settings": {
-                    "number_of_shards": 1,
-                    "number_of_replicas": 0,
-                    "analysis": {
-                      "filter": {
-                        "autocomplete_filter": {
-                          "type": "edge_ngram",
-                          "min_gram": 1,
-                          "max_gram": 20
-                        }
-                      },
-                      "analyzer": {
-                        "autocomplete": {
-                          "type": "custom",
-                          "tokenizer": "standard",
-                          "filter": [
-                            "lowercase",
-                            "autocomplete_filter"
-                          ]
-                        }
-                      }
-                    }
-                },
-                "mappings": {
-                    'need': {
-                        'properties': {
-                            'CreatedAt': {'type': 'date'},
-                            'Author': {'type': 'text'},
-                            'Customer': {'type': 'text'},
-                            'Contact': {'type': 'text'},
-                            'Title': {
-                                'type': 'text',
-                                'analyzer': 'autocomplete',
-                                'search_analyzer': 'standard'
-                            },
-                            'Description': {'type': 'text'},
-                            'SuccessKeys': {'type': 'nested'},
-                            'StartAtLatest': {'type': 'date'},
-                            'MonthDuration': {'type': 'float'},
-                            'WeekFrequency': {'type':  'float'},
-                            'Rate': {'type': 'float'},
-                            'Consultants': {'type': 'nested'},
-                            'Status': {'type': 'text'},
-                        }
-                    },
-                }
-            }
-        )
\ No newline at end of file
+    ensure_index(client, indice)
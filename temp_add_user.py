@@ -2,6 +2,7 @@
 
 from elasticsearch import Elasticsearch
 from config import config
+from app.schemas import ensure_index, get_name_suggest, SUGGEST_FIELDS
 from app.utils import hash_sha256
 
 
@@ -11,49 +12,7 @@ if __name__ == '__main__':
 
     client = Elasticsearch([{'host': app_config.ELS_HOST, 'port': app_config.ELS_PORT}])
 
-    if not client.indices.exists(indice):
-        client.indices.create(
-            index=indice,
-            body={
-                "settings": {
-                    "number_of_shards": 1,
-                    "number_of_replicas": 0,
-                    "analysis": {
-                      "filter": {
-                        "autocomplete_filter": {
-                          "type": "edge_ngram",
-                          "min_gram": 1,
-                          "max_gram": 20
-                        }
-                      },
-                      "analyzer": {
-                        "autocomplete": {
-                          "type": "custom",
-                          "tokenizer": "standard",
-                          "filter": [
-                            "lowercase",
-                            "autocomplete_filter"
-                          ]
-                        }
-                      }
-                    }
-                },
-                "mappings": {
-                    'user': {
-                        'properties': {
-                            'Name': {
-                                'type': 'text',
-                                'analyzer': 'autocomplete',
-                                'search_analyzer': 'standard'
-                            },
-                            'Email': {'type': 'text'},
-                            'PasswordHash': {'type': 'text'},
-                            'Role': {'type': 'text'}
-                        }
-                    },
-                }
-            }
-        )
+    ensure_index(client, indice)
 
     user = {
         'Name': 'Arthur',
@@ -61,6 +20,7 @@ if __name__ == '__main__':
         'PasswordHash': hash_sha256('averdier'),
         'Role': 'commercial'
     }
+    user[SUGGEST_FIELDS['user']] = get_name_suggest(user['Name'])
 
     user_search = client.search(
         index=indice,
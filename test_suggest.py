@@ -16,8 +16,13 @@ if __name__ == '__main__':
         index=indice,
         doc_type='customer',
         body={
-            'query': {
-                'match': {'Name': 'BNP'}
+            'size': 0,
+            '_source': ['Name'],
+            'suggest': {
+                'names': {
+                    'prefix': 'BNP',
+                    'completion': {'field': 'CustomerSuggest', 'size': 10}
+                }
             }
         }
     )